@@ -0,0 +1,155 @@
+"""
+Writing to either a path or to an already open file-handle.
+"""
+
+import contextlib
+import io
+import os
+import numpy as np
+
+
+def is_path(path_or_handle):
+    return isinstance(path_or_handle, (str, bytes, os.PathLike))
+
+
+def _make_text_write(f, encoding):
+    if isinstance(f, io.TextIOBase):
+        return f.write
+    else:
+
+        def write(s):
+            return f.write(s.encode(encoding))
+
+        return write
+
+
+@contextlib.contextmanager
+def open_text_writer(path_or_handle, encoding="utf-8"):
+    """
+    Yields a function 'write(s)' which writes the str 's' into
+    'path_or_handle'. When 'path_or_handle' is a path, the file is opened and
+    closed again. When it is an open handle in binary mode, 's' is encoded
+    using 'encoding' before it is written.
+
+    Parameters
+    ----------
+    path_or_handle : str, os.PathLike, or file-handle
+        Where to write to.
+    encoding : str
+        Used to encode the strings when writing to a binary handle.
+    """
+    if is_path(path_or_handle):
+        with open(path_or_handle, "wb") as f:
+            yield _make_text_write(f=f, encoding=encoding)
+    else:
+        yield _make_text_write(f=path_or_handle, encoding=encoding)
+
+
+@contextlib.contextmanager
+def open_binary_writer(path_or_handle):
+    """
+    Yields a file-handle in binary mode to write to 'path_or_handle'.
+    When 'path_or_handle' is a path, the file is opened and closed again.
+
+    Parameters
+    ----------
+    path_or_handle : str, os.PathLike, or file-handle
+        Where to write to.
+    """
+    if is_path(path_or_handle):
+        with open(path_or_handle, "wb") as f:
+            yield f
+    else:
+        yield path_or_handle
+
+
+@contextlib.contextmanager
+def open_binary_reader(path_or_handle):
+    """
+    Yields a file-handle in binary mode to read from 'path_or_handle'.
+    When 'path_or_handle' is a path, the file is opened and closed again.
+
+    Parameters
+    ----------
+    path_or_handle : str, os.PathLike, or file-handle
+        Where to read from.
+    """
+    if is_path(path_or_handle):
+        with open(path_or_handle, "rb") as f:
+            yield f
+    else:
+        yield path_or_handle
+
+
+def num_bytes_remaining(f):
+    """
+    Returns the number of bytes from the current position of the seekable
+    handle 'f' to its end.
+    """
+    position = f.tell()
+    end = f.seek(0, os.SEEK_END)
+    f.seek(position)
+    return end - position
+
+
+def readinto_exactly(f, buff):
+    """
+    Fills the writable buffer 'buff' with bytes read from 'f'.
+    Raises EOFError when 'f' ends before 'buff' is full.
+    """
+    view = memoryview(buff).cast("B")
+    num_read = 0
+    while num_read < len(view):
+        n = f.readinto(view[num_read:])
+        if not n:
+            raise EOFError(
+                "Expected {:d} bytes, but only got {:d}.".format(
+                    len(view), num_read
+                )
+            )
+        num_read += n
+    return num_read
+
+
+def iter_formatted_rows(line_format, rows, chunk_size):
+    """
+    Yields strings of formatted 'rows'. Each string has up to 'chunk_size'
+    lines and is formatted with a single call to str.format.
+
+    Parameters
+    ----------
+    line_format : str
+        The format of one line. It takes all the values in one row.
+    rows : numpy.array, shape(N, M)
+        The rows to be formatted.
+    chunk_size : int
+        The number of rows formatted at once.
+    """
+    for start in range(0, rows.shape[0], chunk_size):
+        chunk = rows[start : start + chunk_size]
+        yield (line_format * chunk.shape[0]).format(*chunk.ravel().tolist())
+
+
+def num_tokens_per_line(text, num_lines):
+    """
+    Returns the number of tokens separated by whitespace in each of the
+    first 'num_lines' lines of 'text'. Lines which are missing in 'text'
+    have zero tokens.
+
+    Parameters
+    ----------
+    text : bytes
+        The lines separated by newlines.
+    num_lines : int
+        The number of lines to count the tokens in.
+    """
+    b = np.frombuffer(text, dtype=np.uint8)
+    # Whitespace and the other control characters.
+    is_space = b <= ord(" ")
+    is_token_start = ~is_space
+    is_token_start[1:] &= is_space[:-1]
+    token_starts = np.flatnonzero(is_token_start)
+    line_stops = np.append(np.flatnonzero(b == ord("\n")), b.shape[0])
+    num_tokens_before_stop = np.searchsorted(token_starts, line_stops)
+    num_tokens = np.diff(num_tokens_before_stop, prepend=0)[:num_lines]
+    return np.pad(num_tokens, (0, num_lines - num_tokens.shape[0]))
@@ -10,16 +10,20 @@ RC_BAD = 17
 
 def read_any_mesh(path):
     try:
-        with open(path, "rt") as f:
-            stl = triangle_mesh_io.stl.loads(f.read(), mode="t")
-        return triangle_mesh_io.stl.to_vertices_and_faces(stl=stl)
+        stl = triangle_mesh_io.stl.load(path, mode="t")
+        return triangle_mesh_io.stl.to_vertices_and_faces(stl=stl, weld=True)
+    except:
+        pass
+
+    try:
+        off = triangle_mesh_io.off.load(path, mode="b", mmap=True)
+        return triangle_mesh_io.off.to_vertices_and_faces(off=off)
     except:
         pass
 
     try:
-        with open(path, "rb") as f:
-            stl = triangle_mesh_io.stl.loads(f.read(), mode="b")
-        return triangle_mesh_io.stl.to_vertices_and_faces(stl=stl)
+        stl = triangle_mesh_io.stl.load(path, mode="b", mmap=True)
+        return triangle_mesh_io.stl.to_vertices_and_faces(stl=stl, weld=True)
     except:
         pass
 
@@ -101,6 +105,15 @@ def main():
         type=float,
         help=("Vertex normals closer than this are considerd the same."),
     )
+    to_obj_cmd.add_argument(
+        "--vertex-normal-weighting",
+        default="none",
+        choices=["none", "area", "angle"],
+        type=str,
+        help=(
+            "Weight of the face normals when the vertex normals are smoothed."
+        ),
+    )
 
     args = parser.parse_args()
 
@@ -120,6 +133,7 @@ def main():
             vertex_normal_smooth_eps=np.deg2rad(
                 args.vertex_normal_smooth_epsilon_deg
             ),
+            vertex_normal_weighting=args.vertex_normal_weighting,
         )
         with open(args.out_path, "wt") as f:
             f.write(triangle_mesh_io.obj.dumps(obj=obj))
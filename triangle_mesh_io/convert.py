@@ -11,6 +11,7 @@ def stl_to_obj(
     vertex_eps=None,
     vertex_normal_eps=0.0,
     vertex_normal_smooth_eps=np.deg2rad(2.5),
+    vertex_normal_weighting="none",
 ):
     """
     Returns a wavefron-dictionary from an Stereolithography triangle list.
@@ -22,8 +23,11 @@ def stl_to_obj(
         triangle list.
     mtl : str
         The key given to the material in the output wavefront.
+    vertex_normal_weighting : str
+        Either 'none', 'area', or 'angle'. See
+        mesh.init_from_vertices_and_faces_with_vertex_normals().
     """
-    vertices, faces = _stl.to_vertices_and_faces(stl=stl)
+    vertices, faces = _stl.to_vertices_and_faces(stl=stl, weld=True)
     return _mesh.init_from_vertices_and_faces_with_vertex_normals(
         vertices=vertices,
         faces=faces,
@@ -31,6 +35,7 @@ def stl_to_obj(
         vertex_eps=vertex_eps,
         vertex_normal_eps=vertex_normal_eps,
         vertex_normal_smooth_eps=vertex_normal_smooth_eps,
+        vertex_normal_weighting=vertex_normal_weighting,
     )
 
 
@@ -40,6 +45,7 @@ def off_to_obj(
     vertex_eps=None,
     vertex_normal_eps=0.0,
     vertex_normal_smooth_eps=np.deg2rad(2.5),
+    vertex_normal_weighting="none",
 ):
     """
     Returns a wavefron-dictionary from an Object-File-Format-dictionary.
@@ -51,6 +57,9 @@ def off_to_obj(
         Object-File-Format.
     mtl : str
         The key given to the material in the output wavefront.
+    vertex_normal_weighting : str
+        Either 'none', 'area', or 'angle'. See
+        mesh.init_from_vertices_and_faces_with_vertex_normals().
     """
 
     vertices, faces = _off.to_vertices_and_faces(off=off)
@@ -61,4 +70,5 @@ def off_to_obj(
         vertex_eps=vertex_eps,
         vertex_normal_eps=vertex_normal_eps,
         vertex_normal_smooth_eps=vertex_normal_smooth_eps,
+        vertex_normal_weighting=vertex_normal_weighting,
     )
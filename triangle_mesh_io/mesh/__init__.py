@@ -2,6 +2,7 @@ from . import cluster
 from . import normal
 from . import graph
 from . import artifacts
+from . import halfedge
 from .. import obj as _obj
 from .. import stl as _stl
 from .. import off as _off
@@ -30,27 +31,13 @@ class Mesh:
         return cls(vertices=vertices, faces=faces)
 
     def to_stl(self):
-        num_faces = self.faces.shape[0]
-        stl = _stl.init(size=num_faces)
-
         face_normals = normal.make_face_normals_from_vertices_and_faces(
             vertices=self.vertices, faces=self.faces
         )
-
-        v = self.vertices
-        f = self.faces
-        n = face_normals
-        DIMS = {0: "x", 1: "y", 2: "z"}
-        VERTS = {0: "0", 1: "1", 2: "2"}
-        for i in range(num_faces):
-            for vert in VERTS:
-                for dim in DIMS:
-                    stl[f"vertex-{VERTS[vert]:s}.{DIMS[dim]:s}"][i] = v[
-                        f[i, vert], dim
-                    ]
-            for dim in DIMS:
-                stl[f"normal.{DIMS[dim]:s}"][i] = n[i][dim]
-        return stl
+        return _stl.init_from_vertices_and_normals(
+            vertices=self.vertices[self.faces],
+            normals=face_normals,
+        )
 
     @classmethod
     def from_off(cls, off):
@@ -98,7 +85,9 @@ class Mesh:
 """
 
 
-def init_from_vertices_and_faces(vertices, faces, vertex_eps=None):
+def init_from_vertices_and_faces(
+    vertices, faces, vertex_eps=None, min_face_area=None, min_face_quality=None
+):
     """
     Faces refering to near by vertices (w.r.t. vertex_eps distance) will use
     a single common vertex. Duplicate vertices will be removed.
@@ -118,6 +107,11 @@ def init_from_vertices_and_faces(vertices, faces, vertex_eps=None):
         duplicates. If 'None', vertex_eps will be guessed based on the cloud
         of vertices using approx. 1e-5 * a robust estimate for the standard
         deviation of the vertices.
+    min_face_area : float (default: None)
+        If not 'None', faces with a smaller area are removed.
+    min_face_quality : float (default: None)
+        If not 'None', faces with a smaller quality are removed. See
+        artifacts.find_faces_with_small_area_or_bad_quality().
     """
     vertices, faces = artifacts.remove_artifacts_from_vertices_and_faces(
         vertices=vertices, faces=faces
@@ -138,11 +132,16 @@ def init_from_vertices_and_faces(vertices, faces, vertex_eps=None):
         print(err)
         print("Failed to cluster vertices and to remove duplicate vertices.")
 
-    faces = (
-        graph.make_faces_on_same_manifold_have_same_vertex_winding_direction(
-            faces=faces
+    if min_face_area is not None or min_face_quality is not None:
+        faces = artifacts.remove_faces_with_small_area_or_bad_quality(
+            vertices=vertices,
+            faces=faces,
+            min_area=0.0 if min_face_area is None else min_face_area,
+            min_quality=0.0 if min_face_quality is None else min_face_quality,
+        )
+        vertices, faces = artifacts.remove_artifacts_from_vertices_and_faces(
+            vertices=vertices, faces=faces
         )
-    )
 
     try:
         faces = graph.make_faces_on_same_manifold_have_same_vertex_winding_direction(
@@ -159,9 +158,8 @@ def init_from_vertices_and_faces(vertices, faces, vertex_eps=None):
 
 
 def make_faces_use_commen_vertices(vertices, faces, vertex_eps):
-    clusters = cluster.find_clusters(x=vertices, eps=vertex_eps)
-    vertex_replacement_map = cluster.find_replacement_map(
-        x=vertices, clusters=clusters
+    vertex_replacement_map = cluster.weld(
+        x=vertices, eps=vertex_eps, method="grid"
     )
 
     return apply_vertex_replacement_map_to_faces(
@@ -171,15 +169,8 @@ def make_faces_use_commen_vertices(vertices, faces, vertex_eps):
 
 
 def apply_vertex_replacement_map_to_faces(faces, vertex_replacement_map):
-    new_faces = -1 * np.ones(shape=faces.shape, dtype=int)
-    for face_idx in range(faces.shape[0]):
-        vertex_0_idx, vertex_1_idx, vertex_2_idx = faces[face_idx]
-        new_faces[face_idx] = [
-            vertex_replacement_map[vertex_0_idx],
-            vertex_replacement_map[vertex_1_idx],
-            vertex_replacement_map[vertex_2_idx],
-        ]
-    return new_faces
+    vertex_replacement_map = np.asarray(vertex_replacement_map, dtype=int)
+    return vertex_replacement_map[np.asarray(faces, dtype=int)]
 
 
 def init_from_vertices_and_faces_with_vertex_normals(
@@ -189,6 +180,10 @@ def init_from_vertices_and_faces_with_vertex_normals(
     vertex_eps=None,
     vertex_normal_eps=np.deg2rad(1e-9),
     vertex_normal_smooth_eps=np.deg2rad(2.5),
+    vertex_normal_method="cKDTree",
+    vertex_normal_weighting="none",
+    min_face_area=None,
+    min_face_quality=None,
 ):
     """
     Returns a wavefront-dictionary.
@@ -203,54 +198,59 @@ def init_from_vertices_and_faces_with_vertex_normals(
         The faces (triangles) which reference 3 vertices each.
     mtl : str
         The name of the only material in the output wavefront.
+    vertex_normal_method : str
+        How vertex-normals closer than 'vertex_normal_eps' are found, see
+        make_faces_use_commen_vertex_normals().
+    vertex_normal_weighting : str
+        How the normals of the faces are weighted when the vertex-normals
+        are smoothed. Either 'none', 'area', or 'angle', see
+        normal.estimate_corner_normals_based_on_neighbors().
+    min_face_area : float (default: None)
+        See init_from_vertices_and_faces().
+    min_face_quality : float (default: None)
+        See init_from_vertices_and_faces().
     """
 
     vertices, faces = init_from_vertices_and_faces(
-        vertices=vertices, faces=faces, vertex_eps=vertex_eps
+        vertices=vertices,
+        faces=faces,
+        vertex_eps=vertex_eps,
+        min_face_area=min_face_area,
+        min_face_quality=min_face_quality,
     )
 
     face_normals = normal.make_face_normals_from_vertices_and_faces(
         vertices=vertices, faces=faces
     )
 
-    vertices_to_faces = graph.list_faces_sharing_same_vertex(
-        vertices=vertices, faces=faces
+    vertices_to_faces = graph.make_vertex_to_faces_csr(
+        num_vertices=len(vertices), faces=faces
     )
 
-    wavefront = _obj.init()
-    wavefront["mtl"][mtl] = []
+    corner_normals = normal.estimate_corner_normals_based_on_neighbors(
+        faces=faces,
+        face_normals=face_normals,
+        vertex_normal_smooth_eps=vertex_normal_smooth_eps,
+        vertices_to_faces=vertices_to_faces,
+        weighting=vertex_normal_weighting,
+        vertices=vertices,
+    )
 
+    wavefront = _obj.init()
     wavefront["v"] = np.asarray(vertices, dtype=float)
+    wavefront["vn"] = corner_normals.reshape((-1, 3))
 
-    vn_count = 0
-    for face_idx in range(faces.shape[0]):
-        face = faces[face_idx]
-        ff = {}
-        ff["v"] = [face[0], face[1], face[2]]
-
-        fvn = [-1, -1, -1]
-        for vdim in range(3):
-            if vertex_normal_smooth_eps > 0.0:
-                vn = normal.estimate_vertex_normal_based_on_neighbors(
-                    vertex_idx=face[vdim],
-                    face_idx=face_idx,
-                    face_normals=face_normals,
-                    vertices_to_faces=vertices_to_faces,
-                    vertex_normal_smooth_eps=vertex_normal_smooth_eps,
-                )
-            else:
-                vn = face_normals[face_idx]
-
-            wavefront["vn"].append(vn)
-            fvn[vdim] = vn_count
-            vn_count += 1
-
-        ff["vn"] = fvn
-        wavefront["mtl"][mtl].append(ff)
+    faces_vn = np.arange(3 * faces.shape[0]).reshape((-1, 3))
+    wavefront["mtl"][mtl] = [
+        {"v": face_v, "vn": face_vn}
+        for face_v, face_vn in zip(faces.tolist(), faces_vn.tolist())
+    ]
 
     try:
         wavefront = make_faces_use_commen_vertex_normals(
-            obj=wavefront, vertex_normal_eps=vertex_normal_eps
+            obj=wavefront,
+            vertex_normal_eps=vertex_normal_eps,
+            method=vertex_normal_method,
         )
     except Exception as err:
         print(err)
@@ -262,9 +262,36 @@ def init_from_vertices_and_faces_with_vertex_normals(
     return wavefront
 
 
-def make_faces_use_commen_vertex_normals(obj, vertex_normal_eps):
-    clusters = cluster.find_clusters(x=obj["vn"], eps=vertex_normal_eps)
-    vn_map = cluster.find_replacement_map(x=obj["vn"], clusters=clusters)
+def make_faces_use_commen_vertex_normals(
+    obj, vertex_normal_eps, method="cKDTree"
+):
+    """
+    Returns a copy of the wavefront 'obj' where vertex-normals closer than
+    'vertex_normal_eps' to each other are replaced by a single one.
+
+    Parameters
+    ----------
+    obj : dict
+        A wavefront.
+    vertex_normal_eps : float
+        Vertex-normals closer than this are replaced. When this is not
+        positive, only identical vertex-normals are replaced and no
+        clustering is done.
+    method : str
+        Either a method of cluster.find_clusters(), or 'octahedral' which
+        replaces the vertex-normals in the same cell of the quantized
+        octahedral encoding (see normal.quantize_octahedral()). The
+        'octahedral' is faster but misses pairs of vertex-normals which
+        are close but fall into neighboring cells.
+    """
+    vn = np.asarray(obj["vn"], dtype=float)
+    if method == "octahedral" and vertex_normal_eps > 0.0:
+        keys = normal.quantize_octahedral(normals=vn, eps=vertex_normal_eps)
+        vn_map = cluster.weld(x=keys, eps=0.0)
+    elif method == "octahedral":
+        vn_map = cluster.weld(x=vn, eps=0.0)
+    else:
+        vn_map = cluster.weld(x=vn, eps=vertex_normal_eps, method=method)
 
     mtl = apply_vertex_normal_replacement_map_to_materials(
         materials=obj["mtl"],
@@ -1,5 +1,6 @@
 import numpy as np
 import copy
+from . import normal
 
 
 def remove_artifacts_from_vertices_and_faces(vertices, faces):
@@ -15,33 +16,93 @@ def remove_faces_with_less_than_three_unique_vertices(faces):
     Removes faces which only have two or one unique vertices and thus do not
     have a surface in 3D-space.
     """
-    out_faces = []
-
-    for face_idx in range(faces.shape[0]):
-        face = faces[face_idx]
-        num_uniqie_vertices = len(set(face))
-        if num_uniqie_vertices == 3:
-            out_faces.append(face)
-    return np.asarray(out_faces, dtype=int)
+    faces = np.asarray(faces, dtype=int).reshape((-1, 3))
+    f0 = faces[:, 0]
+    f1 = faces[:, 1]
+    f2 = faces[:, 2]
+    has_three_unique_vertices = (f0 != f1) & (f1 != f2) & (f0 != f2)
+    return faces[has_three_unique_vertices]
 
 
 def remove_vertices_which_are_not_used_by_faces(vertices, faces):
-    out_vertices = []
-    out_faces = []
-    vertex_use = {}
-
-    for face_idx in range(faces.shape[0]):
-        face = faces[face_idx]
-        new_face = []
-        for vertex_idx in face:
-            if vertex_idx not in vertex_use:
-                vertex_use[vertex_idx] = len(vertex_use)
-                out_vertices.append(vertices[vertex_idx])
-            new_face.append(vertex_use[vertex_idx])
-        out_faces.append(new_face)
-    return np.asarray(out_vertices, dtype=float), np.asarray(
-        out_faces, dtype=int
+    """
+    Removes the vertices which are not used by any face. The remaining
+    vertices are in the order of their first use by the faces.
+    """
+    vertices = np.asarray(vertices, dtype=float).reshape((-1, 3))
+    faces = np.asarray(faces, dtype=int).reshape((-1, 3))
+
+    used_vertices, first_use, inverse = np.unique(
+        faces.ravel(), return_index=True, return_inverse=True
+    )
+    order = np.argsort(first_use)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.shape[0])
+
+    out_vertices = vertices[used_vertices[order]]
+    out_faces = rank[inverse.reshape(-1)].reshape((-1, 3))
+    return out_vertices, out_faces
+
+
+def find_faces_with_small_area_or_bad_quality(
+    vertices, faces, min_area=0.0, min_quality=0.0
+):
+    """
+    Returns a mask which is True for the faces with an area below
+    'min_area' or a quality below 'min_quality'. Faces with distinct but
+    collinear vertices have an area and a quality of zero.
+
+    The quality is 4 * sqrt(3) * area / (l0**2 + l1**2 + l2**2) with the
+    lengths 'l' of the face's edges. It is one for an equilateral face and
+    goes to zero for slivers.
+
+    Parameters
+    ----------
+    vertices : array like, float, shape(num vertices, 3)
+        The vertices of the mesh.
+    faces : array like, int, shape(num faces, 3)
+        The faces referencing the vertices by index.
+    min_area : float
+        Faces with a smaller area are found.
+    min_quality : float
+        Faces with a smaller quality are found.
+    """
+    vertices = np.asarray(vertices, dtype=float).reshape((-1, 3))
+    faces = np.asarray(faces, dtype=int).reshape((-1, 3))
+
+    cross_products = normal.make_face_cross_products(
+        vertices=vertices, faces=faces
+    )
+    areas = 0.5 * np.linalg.norm(cross_products, axis=1)
+
+    corners = vertices[faces]
+    edges = np.roll(corners, shift=-1, axis=1) - corners
+    sum_squared_lengths = np.sum(edges**2, axis=(1, 2))
+    qualities = np.zeros(faces.shape[0])
+    has_length = sum_squared_lengths > 0.0
+    qualities[has_length] = (
+        4.0 * np.sqrt(3.0) * areas[has_length]
+    ) / sum_squared_lengths[has_length]
+
+    return (areas < min_area) | (qualities < min_quality)
+
+
+def remove_faces_with_small_area_or_bad_quality(
+    vertices, faces, min_area=0.0, min_quality=0.0
+):
+    """
+    Removes the faces with an area below 'min_area' or a quality below
+    'min_quality', see find_faces_with_small_area_or_bad_quality().
+    The vertices are not changed.
+    """
+    faces = np.asarray(faces, dtype=int).reshape((-1, 3))
+    is_bad = find_faces_with_small_area_or_bad_quality(
+        vertices=vertices,
+        faces=faces,
+        min_area=min_area,
+        min_quality=min_quality,
     )
+    return faces[~is_bad]
 
 
 def remove_vertex_normals_which_are_not_used_by_faces(obj):
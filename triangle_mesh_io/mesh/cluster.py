@@ -1,19 +1,68 @@
 import numpy as np
-import sklearn.cluster
 import scipy.spatial
+import scipy.sparse
+import scipy.sparse.csgraph
 
 
-def find_clusters(x, eps):
-    return _find_clusters_dbscan(x=x, eps=eps)
+def find_clusters(x, eps, method="cKDTree"):
+    """
+    Returns the cluster-label of each point in the point cloud 'x'.
+    Points closer than 'eps' to each other are in the same cluster. Points
+    without any neighbor closer than 'eps' are not in any cluster and get
+    the label -1. Like in DBSCAN, the clusters are labeled 0, 1, 2, ... in
+    the order of their first point.
+
+    Parameters
+    ----------
+    x : arraylike, floats
+        A point cloud.
+    eps : float
+        Points in 'x' closer than 'eps' will be considered part of the same
+        cluster.
+    method : str
+        Either 'cKDTree' which finds the pairs of close points using
+        scipy.spatial.cKDTree, or 'grid' which finds the pairs of close
+        points in a grid of cells with size 'eps', or 'dbscan' which uses
+        sklearn.cluster.DBSCAN. All find the same clusters. The 'grid' is
+        fastest when there are only few points within 'eps' of each point.
+    """
+    if method == "cKDTree":
+        return _find_clusters_cKDTree(x=x, eps=eps)
+    elif method == "grid":
+        return _find_clusters_grid(x=x, eps=eps)
+    elif method == "dbscan":
+        return _find_clusters_dbscan(x=x, eps=eps)
+    else:
+        raise KeyError("method must be either 'cKDTree', 'grid', or 'dbscan'.")
 
 
 def _find_clusters_cKDTree(x, eps):
-    pass
+    """
+    Returns the clusters found in the point cloud 'x'.
+    All pairs of points closer than 'eps' are queried from a
+    scipy.spatial.cKDTree. The pairs are joined into clusters as the
+    connected components of the graph of pairs.
 
+    Parameters
+    ----------
+    x : arraylike, floats
+        A point cloud.
+    eps : float
+        points in 'x' closer than 'eps' will be considered part of the same
+        cluster.
+    """
+    x = np.asarray(x, dtype=float)
+    tree = scipy.spatial.cKDTree(x)
+    pairs = tree.query_pairs(r=eps, output_type="ndarray")
+    return _labels_from_pairs(num_points=x.shape[0], pairs=pairs)
 
-def _find_clusters_dbscan(x, eps):
+
+def _find_clusters_grid(x, eps):
     """
     Returns the clusters found in the point cloud 'x'.
+    The pairs of points closer than 'eps' are found using a grid of cells
+    with size 'eps'. The pairs are joined into clusters as the connected
+    components of the graph of pairs.
 
     Parameters
     ----------
@@ -23,51 +72,305 @@ def _find_clusters_dbscan(x, eps):
         points in 'x' closer than 'eps' will be considered part of the same
         cluster.
     """
-    clustering = sklearn.cluster.DBSCAN(eps=eps, min_samples=2).fit(x)
+    x = np.asarray(x, dtype=float)
+    pairs = _find_pairs_grid(x=x, eps=eps)
+    return _labels_from_pairs(num_points=x.shape[0], pairs=pairs)
+
+
+def _grid_neighbor_offsets():
+    """
+    Returns the offsets to the cell itself and to the 13 of its 26
+    neighboring cells which come after it. Each pair of neighboring cells
+    is visited only once.
+    """
+    offsets = []
+    for dx in [-1, 0, 1]:
+        for dy in [-1, 0, 1]:
+            for dz in [-1, 0, 1]:
+                if (dx, dy, dz) >= (0, 0, 0):
+                    offsets.append((dx, dy, dz))
+    return offsets
+
+
+def _find_pairs_grid(x, eps):
+    """
+    Returns the pairs (i, j), i < j, of points in 'x' which are closer
+    than 'eps'.
+
+    The points are sorted into cells of a grid with size 'eps'. A point
+    can only be closer than 'eps' to points in its own cell or in one of
+    the 26 neighboring cells. The cost is linear in the number of points as
+    long as there are only few points in each cell.
+
+    Parameters
+    ----------
+    x : array, floats, shape(num points, 3)
+        A point cloud.
+    eps : float
+        Pairs of points closer than 'eps' are returned.
+    """
+    NUM_DIMS = 3
+    assert x.ndim == 2
+    assert x.shape[1] == NUM_DIMS
+    if x.shape[0] == 0:
+        return np.zeros(shape=(0, 2), dtype=int)
+
+    if eps <= 0.0:
+        # Only identical points are pairs. Chaining the identical points is
+        # enough to join them.
+        _, inverse = find_unique_rows(x=x)
+        order = np.argsort(inverse, kind="stable")
+        is_same = inverse[order[1:]] == inverse[order[:-1]]
+        return np.c_[order[:-1][is_same], order[1:][is_same]]
+
+    cells = np.floor((x - np.min(x, axis=0)) / eps)
+
+    # One spare cell on each side for the neighbors of the outermost cells.
+    cells += 1
+    shape = np.max(cells, axis=0) + 2
+    if np.prod(shape) >= 2**62:
+        # The keys of the cells do not fit into int64.
+        tree = scipy.spatial.cKDTree(x)
+        return tree.query_pairs(r=eps, output_type="ndarray")
+    cells = cells.astype(np.int64)
+    shape = [int(s) for s in shape]
+
+    keys = (cells[:, 0] * shape[1] + cells[:, 1]) * shape[2] + cells[:, 2]
+    order = np.argsort(keys, kind="stable")
+    cell_keys, cell_starts, cell_sizes = np.unique(
+        keys[order], return_index=True, return_counts=True
+    )
+
+    pairs = []
+    for dx, dy, dz in _grid_neighbor_offsets():
+        offset_key = (dx * shape[1] + dy) * shape[2] + dz
+        neighbor_keys = cell_keys + offset_key
+        neighbors = np.searchsorted(cell_keys, neighbor_keys)
+        neighbors[neighbors == cell_keys.shape[0]] = 0
+        has_neighbor = cell_keys[neighbors] == neighbor_keys
+
+        a_cells = np.flatnonzero(has_neighbor)
+        b_cells = neighbors[has_neighbor]
+        a_sizes = cell_sizes[a_cells]
+        b_sizes = cell_sizes[b_cells]
+
+        # All combinations of the points in cell a with the points in cell b.
+        num_combinations = a_sizes * b_sizes
+        combination_cell = np.repeat(
+            np.arange(a_cells.shape[0]), num_combinations
+        )
+        combination_starts = np.cumsum(num_combinations) - num_combinations
+        local = (
+            np.arange(np.sum(num_combinations))
+            - combination_starts[combination_cell]
+        )
+        ia = local // b_sizes[combination_cell]
+        ib = local % b_sizes[combination_cell]
+
+        if offset_key == 0:
+            # Within the same cell, each pair only once.
+            is_once = ia < ib
+            combination_cell = combination_cell[is_once]
+            ia = ia[is_once]
+            ib = ib[is_once]
+
+        i = order[cell_starts[a_cells[combination_cell]] + ia]
+        j = order[cell_starts[b_cells[combination_cell]] + ib]
+
+        is_close = np.linalg.norm(x[i] - x[j], axis=1) <= eps
+        pairs.append(np.c_[i[is_close], j[is_close]])
+
+    pairs = np.concatenate(pairs)
+    return np.sort(pairs, axis=1)
+
+
+def _labels_from_pairs(num_points, pairs):
+    """
+    Returns the cluster-label of each point. Points in the same pair are in
+    the same cluster. Points without a pair get the label -1.
+    Like in DBSCAN, the clusters are labeled in the order of their first
+    point.
 
+    Parameters
+    ----------
+    num_points : int
+        The number of points.
+    pairs : array, int, shape(num pairs, 2)
+        The indices of the points in each pair.
+    """
     NOISE = -1
+    graph = scipy.sparse.coo_matrix(
+        (np.ones(pairs.shape[0], dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+        shape=(num_points, num_points),
+    )
+    num_components, components = scipy.sparse.csgraph.connected_components(
+        csgraph=graph, directed=False
+    )
+    sizes = np.bincount(components, minlength=num_components)
+    _, first_points = np.unique(components, return_index=True)
 
-    clusters = {}
-    for x_i, cluster_i in enumerate(clustering.labels_):
-        if cluster_i == NOISE:
-            continue
+    clusters = np.flatnonzero(sizes >= 2)
+    clusters = clusters[np.argsort(first_points[clusters])]
 
-        if cluster_i not in clusters:
-            clusters[int(cluster_i)] = [int(x_i)]
-        else:
-            clusters[int(cluster_i)].append(int(x_i))
+    component_labels = NOISE * np.ones(shape=num_components, dtype=int)
+    component_labels[clusters] = np.arange(clusters.shape[0])
+    return component_labels[components]
 
-    for cluster_i in clusters:
-        clusters[cluster_i] = sorted(clusters[cluster_i])
 
-    return clusters
+def _find_clusters_dbscan(x, eps):
+    """
+    Returns the clusters found in the point cloud 'x'.
+
+    Parameters
+    ----------
+    x : arraylike, floats
+        A point cloud.
+    eps : float
+        points in 'x' closer than 'eps' will be considered part of the same
+        cluster.
+    """
+    import sklearn.cluster
+
+    clustering = sklearn.cluster.DBSCAN(eps=eps, min_samples=2).fit(x)
+    return np.asarray(clustering.labels_, dtype=int)
 
 
-def find_replacement_map(x, clusters):
+def find_replacement_map(x, labels):
     """
     Returns a map indicating which point in 'x' is replaces by what other
     point in 'x'. This is to eliminate clusters of points. All points in a
-    cluster will be replaced by a single point.
+    cluster will be replaced by the cluster's point with the lowest index.
+
+    Parameters
+    ----------
+    x : arraylike
+        The points.
+    labels : array, int
+        The cluster-label of each point in 'x', see find_clusters().
+        Points with label -1 are not in any cluster.
     """
-    x = np.asarray(x)
+    NOISE = -1
+    num_points = len(x)
+    labels = np.asarray(labels, dtype=int)
+    assert labels.shape == (num_points,)
 
-    _temp_replacement_map = {}
-    for cluster_i in clusters:
-        first_vertx = clusters[cluster_i][0]
-        _temp_replacement_map[first_vertx] = first_vertx
-        for vertex in clusters[cluster_i][1:]:
-            _temp_replacement_map[vertex] = first_vertx
+    replacement_map = np.arange(num_points)
 
-    replacement_map = -1 * np.ones(shape=x.shape[0], dtype=int)
-    for x_i in range(x.shape[0]):
-        if x_i in _temp_replacement_map:
-            replacement_map[x_i] = _temp_replacement_map[x_i]
-        else:
-            replacement_map[x_i] = x_i
+    members = np.flatnonzero(labels != NOISE)
+    if members.shape[0] == 0:
+        return replacement_map
 
+    # members grouped by cluster, and ascending within each cluster.
+    members = members[np.argsort(labels[members], kind="stable")]
+    member_labels = labels[members]
+    cluster_starts = np.flatnonzero(
+        np.concatenate([[True], member_labels[1:] != member_labels[:-1]])
+    )
+    cluster_sizes = np.diff(
+        np.concatenate([cluster_starts, [members.shape[0]]])
+    )
+    first_members = np.minimum.reduceat(members, cluster_starts)
+
+    replacement_map[members] = np.repeat(first_members, cluster_sizes)
     return replacement_map
 
 
+def find_unique_rows(x):
+    """
+    Returns the indices of the unique rows in 'x' and, for each row in 'x',
+    the index of its unique row. The unique rows are represented by their
+    first occurrence in 'x' and are in the order of their first occurrence.
+    So x[unique][inverse] == x.
+
+    The rows are hashed to 64bit keys which are sorted. This is several
+    times faster than np.unique(x, axis=0). Only when two different rows
+    have the same key, np.unique(x, axis=0) is used.
+
+    Parameters
+    ----------
+    x : arraylike, floats, shape(num points, num dims)
+        The rows to be compared. As -0.0 == 0.0, both are the same.
+
+    Returns
+    -------
+    (unique, inverse) : (array of int, array of int)
+    """
+    x = np.asarray(x, dtype=float)
+    assert x.ndim == 2
+    num_points = x.shape[0]
+    if num_points == 0:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+    # Adding 0.0 turns -0.0 into 0.0, so both have the same bits.
+    x = np.ascontiguousarray(x + 0.0)
+    words = x.view(np.uint64).reshape((num_points, x.shape[1]))
+    keys = np.zeros(num_points, dtype=np.uint64)
+    for dim in range(words.shape[1]):
+        keys ^= words[:, dim]
+        keys *= np.uint64(0x9E3779B97F4A7C15)
+        keys ^= keys >> np.uint64(29)
+
+    order = np.argsort(keys)
+    same_key = keys[order[1:]] == keys[order[:-1]]
+    same_row = np.all(x[order[1:]] == x[order[:-1]], axis=1)
+
+    if np.any(same_key != same_row):
+        # Two different rows with the same key, or two identical rows with
+        # different keys which can happen for NaN.
+        _, group_first, group = np.unique(
+            x, axis=0, return_index=True, return_inverse=True
+        )
+        group = group.reshape(-1)
+    else:
+        group_starts = np.flatnonzero(np.concatenate([[True], ~same_key]))
+        group_first = np.minimum.reduceat(order, group_starts)
+        group = np.empty(num_points, dtype=int)
+        group[order] = np.cumsum(np.concatenate([[True], ~same_key])) - 1
+
+    # The groups in the order of their first occurrence.
+    group_order = np.argsort(group_first)
+    group_rank = np.empty_like(group_order)
+    group_rank[group_order] = np.arange(group_order.shape[0])
+    return group_first[group_order], group_rank[group]
+
+
+def weld(x, eps, method="grid"):
+    """
+    Returns the replacement map (see find_replacement_map()) which replaces
+    all points in 'x' which are closer than 'eps' to each other by a single
+    point.
+
+    Identical points are replaced first using find_unique_rows(). Only the
+    unique points are clustered. When 'eps' is not positive, only the
+    identical points are replaced and no clustering is done at all.
+
+    Parameters
+    ----------
+    x : arraylike, floats
+        A point cloud.
+    eps : float
+        Points in 'x' closer than 'eps' will be replaced by a single point.
+    method : str
+        See find_clusters(). The 'grid' is linear in the number of points
+        when 'eps' is small compared to the distances between the points
+        which shall remain.
+    """
+    x = np.asarray(x, dtype=float)
+    unique, inverse = find_unique_rows(x=x)
+
+    if eps <= 0.0:
+        unique_replacement_map = np.arange(unique.shape[0])
+    else:
+        labels = find_clusters(x=x[unique], eps=eps, method=method)
+        unique_replacement_map = find_replacement_map(
+            x=x[unique], labels=labels
+        )
+
+    # The unique points are in the order of their first occurrence. So the
+    # unique point with the lowest index is also the lowest point in 'x'.
+    return unique[unique_replacement_map][inverse]
+
+
 def guess_68_percent_containment_width_1d(x):
     """
     A rather robust estimator for 68% containment width in 'x'.
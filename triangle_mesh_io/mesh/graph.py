@@ -1,4 +1,6 @@
 import numpy as np
+import scipy.sparse
+import scipy.sparse.csgraph
 
 
 def make_face_edges(face):
@@ -10,60 +12,265 @@ def _sort_edge(edge):
 
 
 def list_faces_sharing_same_vertex(vertices, faces):
-    vcon = [[] for i in range(len(vertices))]
-    for face_idx, face in enumerate(faces):
-        for vertex_idx in face:
-            vcon[vertex_idx].append(face_idx)
-    return vcon
-
-
-def find_edges_sharing_faces(faces):
-    edges = {}
-    for fi, face in enumerate(faces):
-        sface = sorted(face)
-        e0, e1, e2 = make_face_edges(sface)
-        e0 = _sort_edge(e0)
-        e1 = _sort_edge(e1)
-        e2 = _sort_edge(e2)
-
-        if e0 not in edges:
-            edges[e0] = [fi]
-        else:
-            edges[e0].append(fi)
+    """
+    Returns a list with one list for each vertex. The list of a vertex
+    contains the indices of the faces using this vertex in ascending order.
+    A face using the same vertex more than once is listed more than once.
+    See also make_vertex_to_faces_csr() which uses much less memory.
+
+    Parameters
+    ----------
+    vertices : list/array of vertices
+        The 3D-vertices of the mesh.
+    faces : list/array of faces
+        The faces (triangles) which reference 3 vertices each.
+    """
+    num_vertices = len(vertices)
+    offsets, face_indices = make_vertex_to_faces_csr(
+        num_vertices=num_vertices, faces=faces
+    )
+    if num_vertices == 0:
+        return []
+    return [f.tolist() for f in np.split(face_indices, offsets[1:-1])]
+
+
+def make_vertex_to_faces_csr(num_vertices, faces):
+    """
+    Returns the faces using each vertex in compressed sparse row (CSR)
+    format. The faces using vertex 'v' are
+    face_indices[offsets[v]:offsets[v + 1]] in ascending order. A face
+    using the same vertex more than once is listed more than once.
+
+    Parameters
+    ----------
+    num_vertices : int
+        The number of vertices in the mesh.
+    faces : list/array of faces
+        The faces (triangles) which reference 3 vertices each.
+
+    Returns
+    -------
+    (offsets, face_indices) : (array of int, array of int)
+        The 'offsets' has num_vertices + 1 entries.
+    """
+    faces = np.asarray(faces, dtype=int).reshape((-1, 3))
+    corners = faces.ravel()
+    if corners.shape[0] > 0:
+        assert np.min(corners) >= 0
+        assert np.max(corners) < num_vertices
+
+    # The stable sort keeps the faces ascending for each vertex.
+    order = np.argsort(corners, kind="stable")
+    face_indices = order // 3
+    counts = np.bincount(corners, minlength=num_vertices)
+    offsets = np.zeros(num_vertices + 1, dtype=int)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets, face_indices
+
+
+def make_vertex_face_incidence_matrix(num_vertices, faces):
+    """
+    Returns the incidence matrix of the vertices and the faces as a
+    scipy.sparse.csr_matrix with shape (num_vertices, num_faces). The entry
+    (v, f) is the number of times face 'f' uses vertex 'v'.
+
+    Parameters
+    ----------
+    num_vertices : int
+        The number of vertices in the mesh.
+    faces : list/array of faces
+        The faces (triangles) which reference 3 vertices each.
+    """
+    faces = np.asarray(faces, dtype=int).reshape((-1, 3))
+    offsets, face_indices = make_vertex_to_faces_csr(
+        num_vertices=num_vertices, faces=faces
+    )
+    incidence = scipy.sparse.csr_matrix(
+        (np.ones(face_indices.shape[0], dtype=int), face_indices, offsets),
+        shape=(num_vertices, faces.shape[0]),
+    )
+    incidence.sum_duplicates()
+    return incidence
+
+
+def make_edge_table(faces):
+    """
+    Returns the table of the undirected edges in the mesh.
+
+    The three directed edges (f0, f1), (f1, f2), (f2, f0) of each face are
+    packed into 64bit keys (lo << 32 | hi) of their lower and higher vertex.
+    The unique keys are the undirected edges.
+
+    Parameters
+    ----------
+    faces : list/array of faces
+        The faces (triangles) which reference 3 vertices each.
+
+    Returns
+    -------
+    edge_table : dict
+        edges : array of int, shape(num edges, 2)
+            The lower and the higher vertex of each edge, sorted by the
+            lower and then by the higher vertex.
+        edges_num_faces : array of int, shape(num edges)
+            How often each edge is used by the faces.
+        faces_edges : array of int, shape(num faces, 3)
+            The edges (f0, f1), (f1, f2), (f2, f0) of each face.
+        faces_edges_forward : array of bool, shape(num faces, 3)
+            True when the face runs along the edge from its lower to its
+            higher vertex.
+        num_boundary_edges : int
+            The number of edges used by only one face.
+        num_non_manifold_edges : int
+            The number of edges used by more than two faces.
+    """
+    faces = np.asarray(faces, dtype=np.int64).reshape((-1, 3))
+    if faces.shape[0] > 0:
+        assert np.min(faces) >= 0
+        assert np.max(faces) < 2**31, "Too many vertices to pack edges."
+
+    start = faces
+    stop = np.roll(faces, shift=-1, axis=1)
+    lo = np.minimum(start, stop)
+    hi = np.maximum(start, stop)
+    keys = (lo << 32) | hi
+
+    unique_keys, inverse, counts = np.unique(
+        keys.ravel(), return_inverse=True, return_counts=True
+    )
 
-        if e1 not in edges:
-            edges[e1] = [fi]
-        else:
-            edges[e1].append(fi)
+    edge_table = {}
+    edge_table["edges"] = np.c_[unique_keys >> 32, unique_keys & (2**32 - 1)]
+    edge_table["edges_num_faces"] = counts
+    edge_table["faces_edges"] = inverse.reshape((-1, 3))
+    edge_table["faces_edges_forward"] = start < stop
+    edge_table["num_boundary_edges"] = int(np.sum(counts == 1))
+    edge_table["num_non_manifold_edges"] = int(np.sum(counts > 2))
+    return edge_table
+
+
+def make_edge_to_faces_csr(edge_table):
+    """
+    Returns the faces using each edge in compressed sparse row (CSR)
+    format. The faces using edge 'e' are
+    face_indices[offsets[e]:offsets[e + 1]] in ascending order.
+
+    Parameters
+    ----------
+    edge_table : dict
+        See make_edge_table().
+
+    Returns
+    -------
+    (offsets, face_indices, face_sides) : (array of int, array of int, ...)
+        The 'face_sides' tells which of the face's three edges it is.
+    """
+    faces_edges = edge_table["faces_edges"].ravel()
+    order = np.argsort(faces_edges, kind="stable")
+    num_edges = edge_table["edges"].shape[0]
+    offsets = np.zeros(num_edges + 1, dtype=int)
+    np.cumsum(edge_table["edges_num_faces"], out=offsets[1:])
+    return offsets, order // 3, order % 3
+
+
+def make_face_to_faces_csr(faces, edge_table=None):
+    """
+    Returns the faces sharing at least one edge with each face in
+    compressed sparse row (CSR) format. The neighbors of face 'f' are
+    neighbor_faces[offsets[f]:offsets[f + 1]] in ascending order. A face is
+    not its own neighbor.
+
+    Parameters
+    ----------
+    faces : list/array of faces
+        The faces (triangles) which reference 3 vertices each.
+    edge_table : dict (optional)
+        See make_edge_table(). Made from 'faces' when None.
+
+    Returns
+    -------
+    (offsets, neighbor_faces, flip) : (array of int, array of int, ...)
+        The 'flip' is True when the neighbor runs along the shared edge in
+        the same direction as the face. The neighbor's winding is then
+        opposite to the face's winding.
+    """
+    faces = np.asarray(faces, dtype=np.int64).reshape((-1, 3))
+    num_faces = faces.shape[0]
+    if edge_table is None:
+        edge_table = make_edge_table(faces=faces)
+
+    edge_offsets, edge_faces, edge_sides = make_edge_to_faces_csr(
+        edge_table=edge_table
+    )
+    edge_sizes = edge_table["edges_num_faces"]
+    edge_forward = edge_table["faces_edges_forward"][edge_faces, edge_sides]
+
+    # All ordered pairs (a, b) of the faces using the same edge.
+    num_pairs = edge_sizes * edge_sizes
+    pair_edge = np.repeat(np.arange(edge_sizes.shape[0]), num_pairs)
+    pair_starts = np.cumsum(num_pairs) - num_pairs
+    local = np.arange(np.sum(num_pairs)) - pair_starts[pair_edge]
+    a = edge_offsets[pair_edge] + local // edge_sizes[pair_edge]
+    b = edge_offsets[pair_edge] + local % edge_sizes[pair_edge]
+
+    fa = edge_faces[a]
+    fb = edge_faces[b]
+    flip = edge_forward[a] == edge_forward[b]
+
+    is_pair = fa != fb
+    fa = fa[is_pair]
+    fb = fb[is_pair]
+    flip = flip[is_pair]
+
+    # Faces sharing more than one edge are neighbors only once.
+    keys = fa * num_faces + fb
+    _, first = np.unique(keys, return_index=True)
+    fa = fa[first]
+    fb = fb[first]
+    flip = flip[first]
+
+    offsets = np.zeros(num_faces + 1, dtype=int)
+    np.cumsum(np.bincount(fa, minlength=num_faces), out=offsets[1:])
+    return offsets, fb, flip
 
-        if e2 not in edges:
-            edges[e2] = [fi]
-        else:
-            edges[e2].append(fi)
 
-    return edges
+def find_edges_sharing_faces(faces):
+    """
+    Returns a dict with the undirected edges (lower vertex, higher vertex)
+    as keys and the lists of the faces using the edge as values.
+
+    Parameters
+    ----------
+    faces : list/array of faces
+        The faces (triangles) which reference 3 vertices each.
+    """
+    edge_table = make_edge_table(faces=faces)
+    offsets, face_indices, _ = make_edge_to_faces_csr(edge_table=edge_table)
+    edges = [tuple(edge) for edge in edge_table["edges"].tolist()]
+    if len(edges) == 0:
+        return {}
+    edges_faces = np.split(face_indices, offsets[1:-1])
+    return {e: f.tolist() for e, f in zip(edges, edges_faces)}
 
 
 def find_faces_sharing_at_least_one_edge(faces):
-    edges = find_edges_sharing_faces(faces)
-    tfaces = {}
-
-    for edge in edges:
-        sfaces = edges[edge]
-        for sface in sfaces:
-            if sface not in tfaces:
-                tfaces[sface] = set(sfaces)
-            else:
-                tfaces[sface].update(set(sfaces))
-
-    # remove face itself
-    for i in tfaces:
-        tfaces[i].remove(i)
-
-    for i in tfaces:
-        tfaces[i] = list(tfaces[i])
-
-    return tfaces
+    """
+    Returns a dict with the index of each face as key and the list of the
+    faces sharing at least one edge with it as value.
+    See also make_face_to_faces_csr().
+
+    Parameters
+    ----------
+    faces : list/array of faces
+        The faces (triangles) which reference 3 vertices each.
+    """
+    faces = np.asarray(faces, dtype=np.int64).reshape((-1, 3))
+    num_faces = faces.shape[0]
+    if num_faces == 0:
+        return {}
+    offsets, neighbor_faces, _ = make_face_to_faces_csr(faces=faces)
+    faces_neighbors = np.split(neighbor_faces, offsets[1:-1])
+    return {i: faces_neighbors[i].tolist() for i in range(num_faces)}
 
 
 def edges_have_same_vertices_independent_of_direction(edge_a, edge_b):
@@ -126,15 +333,120 @@ def make_faces_on_same_manifold_have_same_vertex_winding_direction(
     faces,
     verbose=False,
 ):
-    faces_sharing_at_least_one_edge = find_faces_sharing_at_least_one_edge(
-        faces=faces
+    wound_faces, _ = make_faces_have_same_winding_as_their_neighbors(
+        faces=faces, verbose=verbose
+    )
+    return wound_faces
+
+
+def make_faces_have_same_winding_as_their_neighbors(faces, verbose=False):
+    """
+    Returns the 'wound_faces' where the faces on the same manifold have the
+    same winding direction of their vertices, and the index of the manifold
+    of each face 'faces_manifolds'. A face is flipped by reversing the
+    order of its vertices.
+
+    Like the Flood, each manifold is seeded with its face of the lowest
+    index which keeps its winding. The manifolds are numbered in the order
+    of their seeds. From the seeds, a breadth first search visits all faces
+    layer by layer. Each face in a new layer takes its winding from a
+    neighbor in the previous layer, see find_faces_flips().
+
+    Parameters
+    ----------
+    faces : array, int, shape(num faces, 3)
+        The faces (triangles) which reference 3 vertices each.
+    verbose : bool
+        Print the progress of the search.
+
+    Returns
+    -------
+    (wound_faces, faces_manifolds) : (array of int, array of int)
+    """
+    faces = np.asarray(faces)
+    faces_flips, faces_manifolds = find_faces_flips(
+        faces=faces, verbose=verbose
+    )
+    wound_faces = faces.copy()
+    wound_faces[faces_flips] = np.flip(faces[faces_flips], axis=1)
+    return wound_faces, faces_manifolds
+
+
+def find_faces_flips(faces, face_to_faces_csr=None, verbose=False):
+    """
+    Returns which faces need to be flipped to have the same winding as the
+    other faces on their manifold, and the index of the manifold of each
+    face. See make_faces_have_same_winding_as_their_neighbors().
+
+    Parameters
+    ----------
+    faces : array, int, shape(num faces, 3)
+        The faces (triangles) which reference 3 vertices each.
+    face_to_faces_csr : tuple (optional)
+        The (offsets, neighbor_faces, flip) of make_face_to_faces_csr().
+        Made from 'faces' when None.
+    verbose : bool
+        Print the progress of the search.
+
+    Returns
+    -------
+    (faces_flips, faces_manifolds) : (array of bool, array of int)
+    """
+    faces = np.asarray(faces, dtype=np.int64).reshape((-1, 3))
+    num_faces = faces.shape[0]
+    if face_to_faces_csr is None:
+        face_to_faces_csr = make_face_to_faces_csr(faces=faces)
+    offsets, neighbor_faces, flip = face_to_faces_csr
+    num_neighbors = np.diff(offsets)
+
+    faces_flips = np.zeros(num_faces, dtype=bool)
+    faces_manifolds = -1 * np.ones(num_faces, dtype=int)
+    if num_faces == 0:
+        return faces_flips, faces_manifolds
+
+    adjacency = scipy.sparse.csr_matrix(
+        (
+            np.ones(neighbor_faces.shape[0], dtype=np.int8),
+            neighbor_faces,
+            offsets,
+        ),
+        shape=(num_faces, num_faces),
     )
-    flood = Flood(
-        faces=faces,
-        faces_sharing_at_least_one_edge=faces_sharing_at_least_one_edge,
+    _, components = scipy.sparse.csgraph.connected_components(
+        csgraph=adjacency, directed=False
     )
-    flood.flood()
-    return flood.wound_faces
+    _, seeds = np.unique(components, return_index=True)
+    seeds = np.sort(seeds)
+    faces_manifolds[seeds] = np.arange(seeds.shape[0])
+
+    frontier = seeds
+    while frontier.shape[0] > 0:
+        if verbose:
+            print("frontier", frontier.shape[0])
+
+        # all neighbors of all faces in the frontier
+        sizes = num_neighbors[frontier]
+        source = np.repeat(frontier, sizes)
+        starts = np.cumsum(sizes) - sizes
+        local = np.arange(source.shape[0]) - np.repeat(starts, sizes)
+        slots = offsets[source] + local
+        target = neighbor_faces[slots]
+
+        is_new = faces_manifolds[target] == -1
+        source = source[is_new]
+        target = target[is_new]
+        slots = slots[is_new]
+
+        # Each new face takes its winding from its first neighbor.
+        target, first = np.unique(target, return_index=True)
+        source = source[first]
+        slots = slots[first]
+
+        faces_flips[target] = faces_flips[source] ^ flip[slots]
+        faces_manifolds[target] = faces_manifolds[source]
+        frontier = target
+
+    return faces_flips, faces_manifolds
 
 
 class Flood:
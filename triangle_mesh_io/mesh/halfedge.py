@@ -0,0 +1,225 @@
+import numpy as np
+import scipy.sparse
+import scipy.sparse.csgraph
+from . import graph
+
+
+class HalfEdgeMesh:
+    """
+    A half-edge structure of a triangle mesh, backed by arrays.
+
+    Each face 'f' has the three half-edges 3*f + 0, 3*f + 1, and 3*f + 2
+    which run along its edges (f0, f1), (f1, f2), and (f2, f0).
+
+    Attributes
+    ----------
+    origin : array of int, shape(3 * num faces)
+        The vertex each half-edge starts at.
+    next : array of int, shape(3 * num faces)
+        The next half-edge in the same face.
+    face : array of int, shape(3 * num faces)
+        The face of each half-edge.
+    twin : array of int, shape(3 * num faces)
+        The half-edge running in the opposite direction along the same
+        edge. Only edges used by exactly two faces with opposite winding
+        have twins. All other half-edges have twin -1.
+    edge : array of int, shape(3 * num faces)
+        The undirected edge of each half-edge, see graph.make_edge_table().
+    vertex_outgoing : array of int, shape(num vertices)
+        One half-edge starting at each vertex. When a vertex is on the
+        boundary, this is a half-edge without twin. Vertices which are not
+        used by any face have -1.
+    """
+
+    def __init__(self, vertices, faces):
+        """
+        Parameters
+        ----------
+        vertices : list/array of vertices
+            The 3D-vertices of the mesh.
+        faces : list/array of faces
+            The faces (triangles) which reference 3 vertices each.
+        """
+        self.vertices = np.asarray(vertices, dtype=float)
+        self.faces = np.asarray(faces, dtype=int).reshape((-1, 3))
+        num_vertices = self.vertices.shape[0]
+        num_faces = self.faces.shape[0]
+        num_halfedges = 3 * num_faces
+
+        halfedges = np.arange(num_halfedges)
+        self.origin = self.faces.ravel()
+        self.face = halfedges // 3
+        self.next = 3 * self.face + (halfedges + 1) % 3
+
+        self.edge_table = graph.make_edge_table(faces=self.faces)
+        self.edge = self.edge_table["faces_edges"].ravel()
+        forward = self.edge_table["faces_edges_forward"].ravel()
+
+        offsets, edge_faces, edge_sides = graph.make_edge_to_faces_csr(
+            edge_table=self.edge_table
+        )
+        edge_halfedges = 3 * edge_faces + edge_sides
+        is_pair = self.edge_table["edges_num_faces"] == 2
+        h0 = edge_halfedges[offsets[:-1][is_pair]]
+        h1 = edge_halfedges[offsets[:-1][is_pair] + 1]
+        is_opposite = forward[h0] != forward[h1]
+        h0 = h0[is_opposite]
+        h1 = h1[is_opposite]
+
+        self.twin = -1 * np.ones(num_halfedges, dtype=int)
+        self.twin[h0] = h1
+        self.twin[h1] = h0
+
+        self.vertex_outgoing = -1 * np.ones(num_vertices, dtype=int)
+        self.vertex_outgoing[self.origin] = halfedges
+        is_boundary = self.twin == -1
+        self.vertex_outgoing[self.origin[is_boundary]] = halfedges[is_boundary]
+
+    @property
+    def num_halfedges(self):
+        return self.origin.shape[0]
+
+    def prev(self, halfedge):
+        """
+        Returns the previous half-edge in the same face.
+        """
+        halfedge = np.asarray(halfedge)
+        return 3 * (halfedge // 3) + (halfedge + 2) % 3
+
+    def destination(self, halfedge):
+        """
+        Returns the vertex the half-edge ends at.
+        """
+        return self.origin[self.next[halfedge]]
+
+    def boundary_loops(self):
+        """
+        Returns a list of the boundary loops. Each loop is an array of the
+        vertices along the loop in the direction of the half-edges.
+        Only edges used by exactly one face are boundary edges. When more
+        than one boundary edge starts at the same vertex, the loops through
+        this vertex are ambiguous.
+        """
+        is_boundary = self.edge_table["edges_num_faces"][self.edge] == 1
+        boundary = np.flatnonzero(is_boundary)
+
+        boundary_outgoing = -1 * np.ones(self.vertices.shape[0], dtype=int)
+        boundary_outgoing[self.origin[boundary]] = boundary
+
+        loops = []
+        visited = np.zeros(self.num_halfedges, dtype=bool)
+        for start in boundary:
+            if visited[start]:
+                continue
+            loop = []
+            halfedge = start
+            while halfedge != -1 and not visited[halfedge]:
+                visited[halfedge] = True
+                loop.append(self.origin[halfedge])
+                halfedge = boundary_outgoing[self.destination(halfedge)]
+            loops.append(np.asarray(loop, dtype=int))
+        return loops
+
+    def one_ring(self, vertex):
+        """
+        Returns the neighboring vertices of 'vertex' in the order of the
+        rotation around it, and the faces between them. The rotation
+        starts at the boundary when the vertex is on the boundary. Only the
+        fan of faces reachable via twins from 'vertex_outgoing' is visited.
+
+        Parameters
+        ----------
+        vertex : int
+            The index of the vertex.
+
+        Returns
+        -------
+        (vertices, faces) : (array of int, array of int)
+        """
+        ring_vertices = []
+        ring_faces = []
+        start = self.vertex_outgoing[vertex]
+        halfedge = start
+        while halfedge != -1:
+            ring_vertices.append(self.destination(halfedge))
+            ring_faces.append(self.face[halfedge])
+            incoming = self.prev(halfedge)
+            halfedge = self.twin[incoming]
+            if halfedge == start:
+                break
+            if halfedge == -1:
+                # The last neighbor on the boundary.
+                ring_vertices.append(self.origin[incoming])
+        return (
+            np.asarray(ring_vertices, dtype=int),
+            np.asarray(ring_faces, dtype=int),
+        )
+
+    def vertices_num_fans(self):
+        """
+        Returns the number of fans of each vertex. A fan is a set of faces
+        around the vertex which are connected via twins. A vertex used by
+        faces has one fan when it is manifold. Vertices not used by any
+        face have zero fans.
+        """
+        # Rotate each outgoing half-edge to the next outgoing half-edge.
+        rotated = self.twin[self.prev(np.arange(self.num_halfedges))]
+        has_rotated = rotated != -1
+        rotation = scipy.sparse.coo_matrix(
+            (
+                np.ones(np.sum(has_rotated), dtype=np.int8),
+                (np.flatnonzero(has_rotated), rotated[has_rotated]),
+            ),
+            shape=(self.num_halfedges, self.num_halfedges),
+        )
+        _, fans = scipy.sparse.csgraph.connected_components(
+            csgraph=rotation, directed=False
+        )
+        _, first = np.unique(fans, return_index=True)
+        return np.bincount(
+            self.origin[first], minlength=self.vertices.shape[0]
+        )
+
+    def is_manifold(self):
+        """
+        Returns True when every edge is used by at most two faces, every
+        edge used by two faces has twins, and every vertex has at most one
+        fan.
+        """
+        num_faces = self.edge_table["edges_num_faces"][self.edge]
+        if np.any(num_faces > 2):
+            return False
+        if np.any(self.twin[num_faces == 2] == -1):
+            return False
+        return bool(np.all(self.vertices_num_fans() <= 1))
+
+    def faces_components(self):
+        """
+        Returns the index of the component of each face. Faces connected
+        via twins are in the same component. The components are numbered
+        in the order of their first face.
+        """
+        num_faces = self.faces.shape[0]
+        has_twin = self.twin != -1
+        adjacency = scipy.sparse.coo_matrix(
+            (
+                np.ones(np.sum(has_twin), dtype=np.int8),
+                (self.face[has_twin], self.face[self.twin[has_twin]]),
+            ),
+            shape=(num_faces, num_faces),
+        )
+        _, components = scipy.sparse.csgraph.connected_components(
+            csgraph=adjacency, directed=False
+        )
+        _, first = np.unique(components, return_index=True)
+        order = np.argsort(first)
+        labels = np.empty_like(order)
+        labels[order] = np.arange(order.shape[0])
+        return labels[components]
+
+    def __repr__(self):
+        return "{:s}(num_vertices={:d}, num_faces={:d})".format(
+            self.__class__.__name__,
+            self.vertices.shape[0],
+            self.faces.shape[0],
+        )
@@ -1,6 +1,7 @@
 import numpy as np
 import copy
 import warnings
+from . import graph
 
 
 def make_normal_from_face(a, b, c):
@@ -17,29 +18,84 @@ def make_normal_from_face(a, b, c):
     return n
 
 
-def make_face_normals_from_vertices_and_faces(vertices, faces):
-    normals = []
-    for idx, f in enumerate(faces):
-        a = vertices[f[0]]
-        b = vertices[f[1]]
-        c = vertices[f[2]]
-        try:
-            n = make_normal_from_face(a=a, b=b, c=c)
-            normals.append(n)
-        except RuntimeError:
-            message = f"face #{idx:d}: a "
-            message += str(a)
-            message += ", b "
-            message += str(b)
-            message += ", c "
-            message += str(c)
-            message += " can not be normalized."
-            warnings.warn(message=message, category=RuntimeWarning)
-
-            normals.append([0, 0, 1])
+def make_face_cross_products(vertices, faces):
+    """
+    Returns the cross products (b - a) x (c - a) of the faces (a, b, c).
+    The cross product is normal to the face and its norm is twice the area
+    of the face.
+
+    Parameters
+    ----------
+    vertices : array like, float, shape(num vertices, 3)
+        The vertices of the mesh.
+    faces : array like, int, shape(num faces, 3)
+        The faces referencing the vertices by index.
+
+    Returns
+    -------
+    cross_products : array, float, shape(num faces, 3)
+    """
+    vertices = np.asarray(vertices, dtype=float).reshape((-1, 3))
+    faces = np.asarray(faces, dtype=int).reshape((-1, 3))
+    corners = vertices[faces]
+    a_to_b = corners[:, 1] - corners[:, 0]
+    a_to_c = corners[:, 2] - corners[:, 0]
+    return np.cross(a_to_b, a_to_c)
+
+
+def make_face_normals_from_vertices_and_faces(
+    vertices, faces, return_degenerate=False
+):
+    """
+    Returns the normalized surface-normals (num faces, 3) of the faces.
+    Faces which are too small to be normalized get the normal [0, 0, 1]
+    and one warning lists them all.
+
+    Parameters
+    ----------
+    vertices : array like, float, shape(num vertices, 3)
+        The vertices of the mesh.
+    faces : array like, int, shape(num faces, 3)
+        The faces referencing the vertices by index.
+    return_degenerate : bool
+        If True, also returns the mask of the faces which could not be
+        normalized.
+    """
+    MAX_NUM_FACES_IN_WARNING = 10
+    normals = make_face_cross_products(vertices=vertices, faces=faces)
+    norms = _norms(normals)
+    degenerate = norms <= 1e-9
+
+    normals[~degenerate] /= norms[~degenerate, np.newaxis]
+    normals[degenerate] = [0, 0, 1]
+
+    if np.any(degenerate):
+        degenerate_faces = np.flatnonzero(degenerate)
+        message = "{:d} faces can not be normalized: #".format(
+            degenerate_faces.shape[0]
+        )
+        message += ", #".join(
+            str(i) for i in degenerate_faces[:MAX_NUM_FACES_IN_WARNING]
+        )
+        if degenerate_faces.shape[0] > MAX_NUM_FACES_IN_WARNING:
+            message += ", ..."
+        warnings.warn(message=message, category=RuntimeWarning)
+
+    if return_degenerate:
+        return normals, degenerate
     return normals
 
 
+def _norms(vectors):
+    """
+    Returns the norm of each vector in 'vectors' (num vectors, 3).
+    matmul sums like np.linalg.norm() of a single vector does.
+    """
+    return np.sqrt(
+        np.matmul(vectors[:, np.newaxis, :], vectors[:, :, np.newaxis])
+    ).reshape(vectors.shape[0])
+
+
 def angle_between_rad(a, b):
     NUMERIC_DOT_TOLLERANCE = 1.0 + 1e-9
     _a = np.asarray(a)
@@ -81,3 +137,241 @@ def estimate_vertex_normal_based_on_neighbors(
     vertex_normal = vertex_normal / np.linalg.norm(vertex_normal)
 
     return vertex_normal
+
+
+def encode_octahedral(normals):
+    """
+    Returns the octahedral encoding (u, v) in [-1, 1] x [-1, 1] of each
+    unit normal. The sphere is projected onto the octahedron
+    |x| + |y| + |z| = 1 and the lower half of the octahedron is folded
+    outwards onto the square.
+
+    Parameters
+    ----------
+    normals : array, floats, shape(num normals, 3)
+        The unit normals.
+    """
+    n = np.asarray(normals, dtype=float)
+    assert n.ndim == 2
+    assert n.shape[1] == 3
+    l1 = np.sum(np.abs(n), axis=1)
+    l1[l1 == 0.0] = 1.0
+    u = n[:, 0] / l1
+    v = n[:, 1] / l1
+
+    lower = n[:, 2] < 0.0
+    sign_u = np.where(u >= 0.0, 1.0, -1.0)
+    sign_v = np.where(v >= 0.0, 1.0, -1.0)
+    folded_u = (1.0 - np.abs(v)) * sign_u
+    folded_v = (1.0 - np.abs(u)) * sign_v
+    u = np.where(lower, folded_u, u)
+    v = np.where(lower, folded_v, v)
+    return np.c_[u, v]
+
+
+def quantize_octahedral(normals, eps):
+    """
+    Returns integer keys (num normals, 2) of the cells in the octahedral
+    encoding (see encode_octahedral()) the normals fall into. The cells are
+    small enough that all normals in the same cell are within the angle
+    'eps' of each other. Normals which are within 'eps' but fall into
+    neighboring cells get different keys.
+
+    Parameters
+    ----------
+    normals : array, floats, shape(num normals, 3)
+        The unit normals.
+    eps : float
+        The angle in rad.
+    """
+    # A step in the octahedral encoding turns the normal by at most 3 times
+    # the length of the step. Along the diagonal of a cell this is at most
+    # 3 * sqrt(2) times the size of the cell.
+    MAX_ANGLE_PER_CELL_SIZE = 3.0 * np.sqrt(2.0)
+    assert eps > 0.0
+    cell_size = eps / MAX_ANGLE_PER_CELL_SIZE
+    uv = encode_octahedral(normals=normals)
+    return np.floor((uv + 1.0) / cell_size).astype(np.int64)
+
+
+def make_face_areas(vertices, faces):
+    """
+    Returns the area of each face.
+
+    Parameters
+    ----------
+    vertices : array like, float, shape(num vertices, 3)
+        The vertices of the mesh.
+    faces : array like, int, shape(num faces, 3)
+        The faces referencing the vertices by index.
+    """
+    cross_products = make_face_cross_products(vertices=vertices, faces=faces)
+    return 0.5 * _norms(cross_products)
+
+
+def make_corner_angles(vertices, faces):
+    """
+    Returns the angles in rad (num faces, 3) of the faces at their three
+    corners. Degenerate faces may have angles of zero or pi.
+
+    Parameters
+    ----------
+    vertices : array like, float, shape(num vertices, 3)
+        The vertices of the mesh.
+    faces : array like, int, shape(num faces, 3)
+        The faces referencing the vertices by index.
+    """
+    vertices = np.asarray(vertices, dtype=float).reshape((-1, 3))
+    faces = np.asarray(faces, dtype=int).reshape((-1, 3))
+    corners = vertices[faces]
+    to_next = np.roll(corners, shift=-1, axis=1) - corners
+    to_prev = np.roll(corners, shift=1, axis=1) - corners
+    sin = np.linalg.norm(np.cross(to_next, to_prev), axis=2)
+    cos = np.sum(to_next * to_prev, axis=2)
+    return np.arctan2(sin, cos)
+
+
+def estimate_corner_normals_based_on_neighbors(
+    faces,
+    face_normals,
+    vertex_normal_smooth_eps,
+    vertices_to_faces=None,
+    chunk_size=2**18,
+    weighting="none",
+    vertices=None,
+):
+    """
+    Returns the vertex-normal of each corner of each face, shape
+    (num faces, 3, 3). With weighting 'none', this is
+    estimate_vertex_normal_based_on_neighbors() for all corners at once and
+    gives the same vertex-normals.
+
+    The faces sharing the corner's vertex are gathered from the CSR
+    adjacency of the vertices to the faces. The angles to the corner's face
+    are computed in bulk. The normals of the faces within
+    'vertex_normal_smooth_eps' are summed per corner in the same order as
+    estimate_vertex_normal_based_on_neighbors() does.
+
+    Parameters
+    ----------
+    faces : array like, int, shape(num faces, 3)
+        The faces referencing the vertices by index.
+    face_normals : array like, float, shape(num faces, 3)
+        The surface-normals of the faces.
+    vertex_normal_smooth_eps : float
+        Faces sharing the vertex with normals within this angle to the
+        normal of the corner's face are averaged. When this is not
+        positive, the corners get the normal of their face.
+    vertices_to_faces : tuple (optional)
+        The (offsets, face_indices) of graph.make_vertex_to_faces_csr().
+        Made from 'faces' when None.
+    chunk_size : int
+        The number of corners processed at once.
+    weighting : str
+        How the normals of the faces are weighted in the average. Either
+        'none' for equal weights, 'area' for the area of the face, or
+        'angle' for the face's angle at the corner's vertex.
+    vertices : array like, float, shape(num vertices, 3) (optional)
+        The vertices of the mesh. Needed for weighting 'area' and 'angle'.
+    """
+    NUMERIC_DOT_TOLLERANCE = 1.0 + 1e-9
+    faces = np.asarray(faces, dtype=int).reshape((-1, 3))
+    face_normals = np.asarray(face_normals, dtype=float).reshape((-1, 3))
+    num_faces = faces.shape[0]
+    assert face_normals.shape[0] == num_faces
+
+    if weighting == "none":
+        corner_weights = np.ones(shape=(num_faces, 3), dtype=float)
+    elif weighting == "area":
+        assert vertices is not None, "weighting 'area' needs the vertices."
+        face_areas = make_face_areas(vertices=vertices, faces=faces)
+        corner_weights = np.repeat(face_areas[:, np.newaxis], 3, axis=1)
+    elif weighting == "angle":
+        assert vertices is not None, "weighting 'angle' needs the vertices."
+        corner_weights = make_corner_angles(vertices=vertices, faces=faces)
+    else:
+        raise KeyError("weighting must be either 'none', 'area', or 'angle'.")
+
+    if vertex_normal_smooth_eps <= 0.0:
+        return np.repeat(face_normals[:, np.newaxis, :], repeats=3, axis=1)
+
+    if vertices_to_faces is None:
+        num_vertices = np.max(faces) + 1 if num_faces > 0 else 0
+        vertices_to_faces = graph.make_vertex_to_faces_csr(
+            num_vertices=num_vertices, faces=faces
+        )
+    offsets, face_indices = vertices_to_faces
+    num_neighbors = np.diff(offsets)
+
+    # The corner's face normal as it is normalized in angle_between_rad(),
+    # and the neighbor's normal as it is normalized before it is averaged
+    # and once more in angle_between_rad().
+    unit_normals = face_normals / _norms(face_normals)[:, np.newaxis]
+    unit_unit_normals = unit_normals / _norms(unit_normals)[:, np.newaxis]
+
+    corner_faces = np.repeat(np.arange(num_faces), 3)
+    corner_vertices = faces.ravel()
+    corner_normals = np.zeros(shape=(3 * num_faces, 3), dtype=float)
+
+    for start in range(0, 3 * num_faces, chunk_size):
+        stop = min(start + chunk_size, 3 * num_faces)
+        c_faces = corner_faces[start:stop]
+        c_vertices = corner_vertices[start:stop]
+        num_corners = stop - start
+
+        # all faces sharing the vertex of each corner
+        sizes = num_neighbors[c_vertices]
+        pair_corner = np.repeat(np.arange(num_corners), sizes)
+        pair_starts = np.cumsum(sizes) - sizes
+        local = np.arange(pair_corner.shape[0]) - pair_starts[pair_corner]
+        pair_face = face_indices[offsets[c_vertices][pair_corner] + local]
+
+        an = unit_normals[c_faces[pair_corner]]
+        bn = unit_unit_normals[pair_face]
+        theta = np.matmul(an[:, np.newaxis, :], bn[:, :, np.newaxis])
+        theta = theta.reshape(pair_corner.shape[0])
+        theta[(theta > 1.0) & (theta < NUMERIC_DOT_TOLLERANCE)] = 1.0
+        with np.errstate(invalid="ignore"):
+            angle = np.arccos(theta)
+
+        is_smooth = angle <= vertex_normal_smooth_eps
+        is_smooth &= pair_face != c_faces[pair_corner]
+        pair_corner = pair_corner[is_smooth]
+        pair_face = pair_face[is_smooth]
+
+        # the neighbor's weight at the corner's vertex
+        pair_side = np.argmax(
+            faces[pair_face] == c_vertices[pair_corner][:, np.newaxis], axis=1
+        )
+        pair_weights = corner_weights[pair_face, pair_side]
+        own_weights = corner_weights[c_faces, np.arange(start, stop) % 3]
+
+        # Sum the normals of each corner in the order of the faces, one
+        # rank of neighbors after the other.
+        num_smooth = np.bincount(pair_corner, minlength=num_corners)
+        smooth_starts = np.cumsum(num_smooth) - num_smooth
+        rank = np.arange(pair_corner.shape[0]) - smooth_starts[pair_corner]
+        order = np.argsort(rank, kind="stable")
+        rank_stops = np.cumsum(np.bincount(rank))
+
+        # Like np.average(), the sums start at 0.0 which turns -0.0 into 0.0.
+        sums = 0.0 + own_weights[:, np.newaxis] * face_normals[c_faces]
+        rank_start = 0
+        for rank_stop in rank_stops:
+            r = order[rank_start:rank_stop]
+            sums[pair_corner[r]] += (
+                pair_weights[r, np.newaxis] * unit_normals[pair_face[r]]
+            )
+            rank_start = rank_stop
+
+        sum_weights = own_weights + np.bincount(
+            pair_corner, weights=pair_weights, minlength=num_corners
+        )
+        averages = face_normals[c_faces].copy()
+        has_weight = sum_weights > 0.0
+        averages[has_weight] = (
+            sums[has_weight] / sum_weights[has_weight, np.newaxis]
+        )
+        corner_normals[start:stop] = averages / _norms(averages)[:, np.newaxis]
+
+    return corner_normals.reshape((num_faces, 3, 3))
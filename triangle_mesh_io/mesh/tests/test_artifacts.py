@@ -0,0 +1,69 @@
+import triangle_mesh_io as tmi
+import numpy as np
+
+
+def test_remove_faces_with_less_than_three_unique_vertices():
+    faces = np.array([[0, 1, 2], [0, 0, 1], [1, 2, 1], [2, 1, 2], [3, 4, 5]])
+    out = tmi.mesh.artifacts.remove_faces_with_less_than_three_unique_vertices(
+        faces=faces
+    )
+    assert out.tolist() == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_remove_vertices_which_are_not_used_by_faces():
+    vertices = [[i, 0, 0] for i in range(6)]
+    faces = [[4, 2, 5], [5, 2, 0]]
+    out_vertices, out_faces = (
+        tmi.mesh.artifacts.remove_vertices_which_are_not_used_by_faces(
+            vertices=vertices, faces=faces
+        )
+    )
+    assert out_vertices[:, 0].tolist() == [4, 2, 5, 0]
+    assert out_faces.tolist() == [[0, 1, 2], [2, 1, 3]]
+
+
+def test_remove_artifacts_no_faces():
+    vertices, faces = (
+        tmi.mesh.artifacts.remove_artifacts_from_vertices_and_faces(
+            vertices=[[0, 0, 0]], faces=np.zeros(shape=(0, 3), dtype=int)
+        )
+    )
+    assert vertices.shape == (0, 3)
+    assert faces.shape == (0, 3)
+
+
+def test_remove_faces_with_small_area_or_bad_quality():
+    vertices = [
+        [0, 0, 0],
+        [1, 0, 0],
+        [0.5, np.sqrt(3) / 2, 0],
+        [2, 0, 0],
+        [0.5, 1e-3, 0],
+    ]
+    # equilateral, collinear, sliver
+    faces = [[0, 1, 2], [0, 1, 3], [0, 1, 4]]
+    _find = tmi.mesh.artifacts.find_faces_with_small_area_or_bad_quality
+
+    is_bad = _find(vertices=vertices, faces=faces)
+    assert is_bad.tolist() == [False, False, False]
+
+    is_bad = _find(vertices=vertices, faces=faces, min_area=1e-9)
+    assert is_bad.tolist() == [False, True, False]
+
+    is_bad = _find(vertices=vertices, faces=faces, min_quality=0.1)
+    assert is_bad.tolist() == [False, True, True]
+
+    out_faces = tmi.mesh.artifacts.remove_faces_with_small_area_or_bad_quality(
+        vertices=vertices, faces=faces, min_quality=0.1
+    )
+    assert out_faces.tolist() == [[0, 1, 2]]
+
+
+def test_init_from_vertices_and_faces_min_face_area():
+    vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [2, 0, 0], [3, 0, 0]]
+    faces = [[0, 1, 2], [1, 3, 4]]
+    out_vertices, out_faces = tmi.mesh.init_from_vertices_and_faces(
+        vertices=vertices, faces=faces, vertex_eps=1e-6, min_face_area=1e-9
+    )
+    assert out_vertices.shape == (3, 3)
+    assert out_faces.shape == (1, 3)
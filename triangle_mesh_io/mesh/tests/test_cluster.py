@@ -0,0 +1,108 @@
+import triangle_mesh_io as tmi
+import numpy as np
+import pytest
+
+
+def test_find_clusters_methods_are_equal():
+    prng = np.random.Generator(np.random.PCG64(42))
+    centers = prng.uniform(size=(1000, 3))
+    x = np.concatenate(
+        [
+            centers,
+            centers[0:500] + prng.normal(scale=1e-4, size=(500, 3)),
+            prng.uniform(size=(200, 3)),
+        ]
+    )
+    x = x[prng.permutation(x.shape[0])]
+
+    for eps in [1e-3, 1e-2]:
+        labels_dbscan = tmi.mesh.cluster.find_clusters(
+            x=x, eps=eps, method="dbscan"
+        )
+        labels_cKDTree = tmi.mesh.cluster.find_clusters(
+            x=x, eps=eps, method="cKDTree"
+        )
+        labels_grid = tmi.mesh.cluster.find_clusters(
+            x=x, eps=eps, method="grid"
+        )
+        assert np.max(labels_cKDTree) > 0
+        np.testing.assert_array_equal(labels_dbscan, labels_cKDTree)
+        np.testing.assert_array_equal(labels_grid, labels_cKDTree)
+
+
+def test_find_clusters_chain():
+    x = [[0, 0, 0], [0.9, 0, 0], [1.8, 0, 0], [5, 0, 0], [5.5, 0, 0]]
+    for method in ["cKDTree", "grid", "dbscan"]:
+        labels = tmi.mesh.cluster.find_clusters(x=x, eps=1.0, method=method)
+        assert labels.tolist() == [0, 0, 0, 1, 1]
+
+
+def test_find_clusters_identical_points():
+    x = [[0, 0, 0], [1, 0, 0], [0, 0, 0], [1, 0, 1e-9], [1, 0, 0]]
+    for method in ["cKDTree", "grid"]:
+        labels = tmi.mesh.cluster.find_clusters(x=x, eps=0.0, method=method)
+        assert labels.tolist() == [0, 1, 0, -1, 1]
+
+
+def test_find_replacement_map():
+    labels = [1, -1, 0, 1, 0, -1, 1]
+    replacement_map = tmi.mesh.cluster.find_replacement_map(
+        x=np.zeros(shape=(7, 3)), labels=labels
+    )
+    assert replacement_map.tolist() == [0, 1, 2, 0, 2, 5, 0]
+
+    replacement_map = tmi.mesh.cluster.find_replacement_map(
+        x=np.zeros(shape=(3, 3)), labels=[-1, -1, -1]
+    )
+    assert replacement_map.tolist() == [0, 1, 2]
+
+
+def test_weld():
+    x = [[0, 0, 0], [1, 0, 0], [0, 0, 1e-6], [1, 1, 1], [1, 0, 1e-6]]
+    replacement_map = tmi.mesh.cluster.weld(x=x, eps=1e-3)
+    assert replacement_map.tolist() == [0, 1, 0, 3, 1]
+
+    faces = [[0, 1, 3], [2, 4, 3]]
+    faces = tmi.mesh.apply_vertex_replacement_map_to_faces(
+        faces=np.asarray(faces), vertex_replacement_map=replacement_map
+    )
+    assert faces.tolist() == [[0, 1, 3], [0, 1, 3]]
+
+
+def test_find_clusters_no_points():
+    x = np.zeros(shape=(0, 3))
+    for method in ["cKDTree", "grid"]:
+        labels = tmi.mesh.cluster.find_clusters(x=x, eps=1.0, method=method)
+        assert labels.shape == (0,)
+
+
+def test_find_clusters_bad_method():
+    with pytest.raises(KeyError):
+        tmi.mesh.cluster.find_clusters(x=[[0, 0, 0]], eps=1.0, method="?")
+
+
+def test_find_unique_rows():
+    x = [[1, 0, 0], [0, 0, 0], [1, 0, 0], [-0.0, 0, 0], [2, 0, 0]]
+    unique, inverse = tmi.mesh.cluster.find_unique_rows(x=x)
+    assert unique.tolist() == [0, 1, 4]
+    assert inverse.tolist() == [0, 1, 0, 1, 2]
+
+
+def test_weld_tiny_eps():
+    x = [[0, 0, 1], [0, 0, 1], [0, 1e-300, 1], [0, 0, 1]]
+    replacement_map = tmi.mesh.cluster.weld(x=x, eps=1e-20)
+    assert replacement_map.tolist() == [0, 0, 0, 0]
+
+    replacement_map = tmi.mesh.cluster.weld(x=x, eps=0.0)
+    assert replacement_map.tolist() == [0, 0, 2, 0]
+
+    x = [[1e6, 0, 0], [0, 0, 0], [0, 0, 1e-12]]
+    for method in ["cKDTree", "grid"]:
+        replacement_map = tmi.mesh.cluster.weld(x=x, eps=1e-11, method=method)
+        assert replacement_map.tolist() == [0, 1, 1]
+
+
+def test_find_clusters_grid_with_many_cells():
+    x = [[0, 0, 0], [1e9, 0, 0], [1e9, 0, 1e-12]]
+    labels = tmi.mesh.cluster.find_clusters(x=x, eps=1e-11, method="grid")
+    assert labels.tolist() == [-1, 0, 0]
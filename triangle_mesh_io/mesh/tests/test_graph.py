@@ -114,3 +114,78 @@ def test_find_faces_sharing_at_least_one_edge():
                     )
                 )
                 assert not do_share
+
+
+def test_make_vertex_to_faces_csr():
+    faces = [[0, 1, 2], [2, 1, 3], [3, 3, 4]]
+    offsets, face_indices = tmi.mesh.graph.make_vertex_to_faces_csr(
+        num_vertices=6, faces=faces
+    )
+    assert offsets.tolist() == [0, 1, 3, 5, 8, 9, 9]
+    assert face_indices.tolist() == [0, 0, 1, 0, 1, 1, 2, 2, 2]
+
+    fsv = tmi.mesh.graph.list_faces_sharing_same_vertex(
+        vertices=range(6), faces=faces
+    )
+    assert fsv == [[0], [0, 1], [0, 1], [1, 2, 2], [2], []]
+
+    incidence = tmi.mesh.graph.make_vertex_face_incidence_matrix(
+        num_vertices=6, faces=faces
+    )
+    assert incidence.shape == (6, 3)
+    assert incidence[3, 2] == 2
+    assert incidence.sum() == 9
+
+
+def test_make_edge_table():
+    """
+    3---2
+    | / |
+    0---1   and face 2 is a fin on edge (0, 2)
+    """
+    faces = [[0, 1, 2], [0, 2, 3], [2, 0, 4]]
+    edge_table = tmi.mesh.graph.make_edge_table(faces=faces)
+    assert edge_table["edges"].tolist() == [
+        [0, 1],
+        [0, 2],
+        [0, 3],
+        [0, 4],
+        [1, 2],
+        [2, 3],
+        [2, 4],
+    ]
+    assert edge_table["edges_num_faces"].tolist() == [1, 3, 1, 1, 1, 1, 1]
+    assert edge_table["faces_edges"][0].tolist() == [0, 4, 1]
+    assert edge_table["faces_edges_forward"][0].tolist() == [True, True, False]
+    assert edge_table["num_boundary_edges"] == 6
+    assert edge_table["num_non_manifold_edges"] == 1
+
+
+def test_make_face_to_faces_csr():
+    faces = [[0, 1, 2], [0, 2, 3], [2, 3, 4], [7, 8, 9]]
+    offsets, neighbor_faces, flip = tmi.mesh.graph.make_face_to_faces_csr(
+        faces=faces
+    )
+    assert offsets.tolist() == [0, 1, 3, 4, 4]
+    assert neighbor_faces.tolist() == [1, 0, 2, 1]
+    assert flip.tolist() == [False, False, True, True]
+
+    fse = tmi.mesh.graph.find_faces_sharing_at_least_one_edge(faces=faces)
+    assert fse == {0: [1], 1: [0, 2], 2: [1], 3: []}
+
+
+def test_make_faces_have_same_winding_as_their_neighbors():
+    faces = [[0, 1, 2], [2, 3, 0], [2, 3, 4], [7, 8, 9], [9, 7, 6]]
+    _make = tmi.mesh.graph.make_faces_have_same_winding_as_their_neighbors
+    wound_faces, faces_manifolds = _make(faces=faces)
+    assert wound_faces.tolist() == [
+        [0, 1, 2],
+        [2, 3, 0],
+        [4, 3, 2],
+        [7, 8, 9],
+        [6, 7, 9],
+    ]
+    assert faces_manifolds.tolist() == [0, 0, 0, 1, 1]
+
+    _, flip = tmi.mesh.graph.make_face_to_faces_csr(faces=wound_faces)[1:]
+    assert not any(flip)
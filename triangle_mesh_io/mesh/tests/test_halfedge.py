@@ -0,0 +1,66 @@
+import triangle_mesh_io as tmi
+import numpy as np
+
+
+def make_square():
+    """
+    3---2
+    | / |
+    0---1
+    """
+    vertices = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]
+    faces = [[0, 1, 2], [0, 2, 3]]
+    return vertices, faces
+
+
+def test_square():
+    vertices, faces = make_square()
+    hem = tmi.mesh.halfedge.HalfEdgeMesh(vertices=vertices, faces=faces)
+    assert hem.num_halfedges == 6
+    assert hem.origin.tolist() == [0, 1, 2, 0, 2, 3]
+    assert hem.next.tolist() == [1, 2, 0, 4, 5, 3]
+    assert hem.face.tolist() == [0, 0, 0, 1, 1, 1]
+    assert hem.twin.tolist() == [-1, -1, 3, 2, -1, -1]
+    assert hem.vertex_outgoing.tolist() == [0, 1, 4, 5]
+
+    loops = hem.boundary_loops()
+    assert len(loops) == 1
+    assert loops[0].tolist() == [0, 1, 2, 3]
+
+    ring_vertices, ring_faces = hem.one_ring(vertex=0)
+    assert ring_vertices.tolist() == [1, 2, 3]
+    assert ring_faces.tolist() == [0, 1]
+
+    assert hem.is_manifold()
+    assert hem.vertices_num_fans().tolist() == [1, 1, 1, 1]
+    assert hem.faces_components().tolist() == [0, 0]
+
+
+def test_closed_cube():
+    vertices, faces = tmi.off.to_vertices_and_faces(off=tmi.off.minimal())
+    faces, _ = tmi.mesh.graph.make_faces_have_same_winding_as_their_neighbors(
+        faces=faces
+    )
+    hem = tmi.mesh.halfedge.HalfEdgeMesh(vertices=vertices, faces=faces)
+    assert np.all(hem.twin != -1)
+    assert np.all(hem.twin[hem.twin] == np.arange(hem.num_halfedges))
+    assert len(hem.boundary_loops()) == 0
+    assert hem.is_manifold()
+    assert np.all(hem.faces_components() == 0)
+
+    for vertex in range(len(vertices)):
+        ring_vertices, ring_faces = hem.one_ring(vertex=vertex)
+        assert len(ring_vertices) == len(ring_faces)
+        for face in ring_faces:
+            assert vertex in faces[face]
+
+
+def test_non_manifold():
+    vertices, faces = make_square()
+    # a fin on edge (0, 2) and a second square touching only in vertex 2
+    vertices = vertices + [[1, 1, 1], [2, 1, 0], [2, 2, 0]]
+    faces = faces + [[2, 0, 4], [2, 5, 6]]
+    hem = tmi.mesh.halfedge.HalfEdgeMesh(vertices=vertices, faces=faces)
+    assert not hem.is_manifold()
+    assert hem.vertices_num_fans()[2] == 4
+    assert hem.faces_components().tolist() == [0, 1, 2, 3]
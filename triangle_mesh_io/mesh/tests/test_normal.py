@@ -1,5 +1,6 @@
 import triangle_mesh_io as tmi
 import numpy as np
+import pytest
 
 
 def in_margin(a, b, eps):
@@ -92,3 +93,160 @@ def test_estimate_vertex_normal_based_on_neighbors():
     assert in_margin(_theta(n(2, 0), unit_my), 0.0, d2r(1e-6))
     assert in_margin(_theta(n(2, 1), unit_my), 0.0, d2r(1e-6))
     assert in_margin(_theta(n(2, 2), unit_my), 0.0, d2r(1e-6))
+
+
+def test_quantize_octahedral_cells_are_within_eps():
+    prng = np.random.Generator(np.random.PCG64(13))
+    normals = prng.normal(size=(100000, 3))
+    normals /= np.linalg.norm(normals, axis=1)[:, np.newaxis]
+
+    eps = np.deg2rad(2.0)
+    keys = tmi.mesh.normal.quantize_octahedral(normals=normals, eps=eps)
+    unique, inverse = tmi.mesh.cluster.find_unique_rows(x=keys)
+    assert unique.shape[0] < normals.shape[0]
+
+    representatives = normals[unique][inverse]
+    cos = np.sum(representatives * normals, axis=1)
+    assert np.all(np.arccos(np.clip(cos, -1, 1)) <= eps)
+
+
+def test_make_face_normals_from_vertices_and_faces():
+    vertices = [[0, 0, 0], [2, 0, 0], [0, 2, 0], [4, 0, 0]]
+    faces = [[0, 1, 2], [0, 2, 1], [0, 1, 3], [1, 1, 2]]
+
+    cross_products = tmi.mesh.normal.make_face_cross_products(
+        vertices=vertices, faces=faces
+    )
+    assert cross_products.tolist() == [
+        [0, 0, 4],
+        [0, 0, -4],
+        [0, 0, 0],
+        [0, 0, 0],
+    ]
+
+    with pytest.warns(RuntimeWarning) as record:
+        normals, degenerate = (
+            tmi.mesh.normal.make_face_normals_from_vertices_and_faces(
+                vertices=vertices, faces=faces, return_degenerate=True
+            )
+        )
+    assert len(record) == 1
+    assert normals.shape == (4, 3)
+    assert normals.tolist() == [[0, 0, 1], [0, 0, -1], [0, 0, 1], [0, 0, 1]]
+    assert degenerate.tolist() == [False, False, True, True]
+
+
+def test_estimate_corner_normals_equals_vertex_normal_estimate():
+    prng = np.random.Generator(np.random.PCG64(7))
+    vertices = prng.uniform(size=(30, 3))
+    faces = prng.integers(low=0, high=30, size=(200, 3))
+    faces = faces[np.all(np.diff(np.sort(faces, axis=1), axis=1) > 0, axis=1)]
+
+    face_normals = tmi.mesh.normal.make_face_normals_from_vertices_and_faces(
+        vertices=vertices, faces=faces
+    )
+    vertices_to_faces = tmi.mesh.graph.list_faces_sharing_same_vertex(
+        vertices=vertices, faces=faces
+    )
+
+    _estimate = tmi.mesh.normal.estimate_vertex_normal_based_on_neighbors
+    for eps in [0.0, np.deg2rad(10.0), np.deg2rad(60.0), np.pi]:
+        corner_normals = (
+            tmi.mesh.normal.estimate_corner_normals_based_on_neighbors(
+                faces=faces,
+                face_normals=face_normals,
+                vertex_normal_smooth_eps=eps,
+                chunk_size=100,
+            )
+        )
+        assert corner_normals.shape == (faces.shape[0], 3, 3)
+
+        for face_idx in range(faces.shape[0]):
+            for vdim in range(3):
+                if eps > 0.0:
+                    vn = _estimate(
+                        vertex_idx=faces[face_idx][vdim],
+                        face_idx=face_idx,
+                        face_normals=face_normals,
+                        vertices_to_faces=vertices_to_faces,
+                        vertex_normal_smooth_eps=eps,
+                    )
+                else:
+                    vn = face_normals[face_idx]
+                np.testing.assert_array_equal(
+                    corner_normals[face_idx, vdim], vn
+                )
+
+
+def test_make_corner_angles():
+    vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [5, 3, 1]]
+    faces = [[0, 1, 2], [3, 1, 2]]
+    angles = tmi.mesh.normal.make_corner_angles(vertices=vertices, faces=faces)
+    np.testing.assert_allclose(angles[0], np.deg2rad([90, 45, 45]))
+    np.testing.assert_allclose(np.sum(angles, axis=1), [np.pi, np.pi])
+
+    areas = tmi.mesh.normal.make_face_areas(vertices=vertices, faces=faces)
+    assert areas[0] == 0.5
+
+
+def test_estimate_corner_normals_weighting():
+    """
+    A large face 0 in the xy-plane with an angle of 90deg at vertex 0, and a
+    small face 1 with an angle of 30deg at vertex 0. Face 1 is tilted by
+    2deg around the x-axis.
+    """
+    tilt = np.deg2rad(2.0)
+    angle = np.deg2rad(30.0)
+    vertices = [
+        [0, 0, 0],
+        [10, 0, 0],
+        [0, 10, 0],
+        [-1, 0, 0],
+        [
+            -np.cos(angle),
+            -np.sin(angle) * np.cos(tilt),
+            -np.sin(angle) * np.sin(tilt),
+        ],
+    ]
+    faces = [[0, 1, 2], [0, 3, 4]]
+    face_normals = tmi.mesh.normal.make_face_normals_from_vertices_and_faces(
+        vertices=vertices, faces=faces
+    )
+    np.testing.assert_allclose(face_normals[0], [0, 0, 1])
+    np.testing.assert_allclose(
+        face_normals[1], [0, -np.sin(tilt), np.cos(tilt)]
+    )
+
+    corner_0 = {}
+    for weighting in ["none", "area", "angle"]:
+        corner_normals = (
+            tmi.mesh.normal.estimate_corner_normals_based_on_neighbors(
+                faces=faces,
+                face_normals=face_normals,
+                vertex_normal_smooth_eps=np.deg2rad(5.0),
+                weighting=weighting,
+                vertices=vertices,
+            )
+        )
+        np.testing.assert_allclose(np.linalg.norm(corner_normals, axis=2), 1.0)
+        np.testing.assert_allclose(corner_normals[0, 0], corner_normals[1, 0])
+        corner_0[weighting] = corner_normals[1, 0]
+
+    np.testing.assert_allclose(
+        corner_0["none"], [0, -np.sin(tilt / 2), np.cos(tilt / 2)]
+    )
+    assert corner_0["area"][2] > corner_0["none"][2]
+
+    # The face normals weighted by their angles of 90deg and 30deg.
+    expected = 90.0 * face_normals[0] + 30.0 * face_normals[1]
+    expected /= np.linalg.norm(expected)
+    np.testing.assert_allclose(corner_0["angle"], expected)
+    assert not np.allclose(corner_0["angle"], corner_0["none"])
+
+    with pytest.raises(KeyError):
+        tmi.mesh.normal.estimate_corner_normals_based_on_neighbors(
+            faces=faces,
+            face_normals=face_normals,
+            vertex_normal_smooth_eps=np.deg2rad(5.0),
+            weighting="?",
+        )
@@ -1,5 +1,6 @@
+from . import _file
 import numpy as np
-import io
+import re
 
 
 def init():
@@ -58,42 +59,84 @@ def minimal():
     return loads(obj_str)
 
 
-def dumps(obj):
+def dumps(obj, float_format="{:f}"):
     """
     Serializes a wavefront-object-dict into a string.
 
     Parameters
     ----------
-    obj : dict (object-wavefront-dict)
+    obj : dict (object-wavefront-dict or columnar object-wavefront-dict)
+        The object-wavefront to be serialized.
+    float_format : str
+        The format-string for the floats in 'v' and 'vn'. Use '{}' for the
+        shortest representation which reads back to the identical float.
+    """
+    return "".join(_iter_dumps(obj=obj, float_format=float_format))
+
+
+def dump(obj, path_or_handle, float_format="{:f}", chunk_size=65536):
+    """
+    Serializes a wavefront-object-dict into a file. The vertices,
+    vertex-normals, and faces are formatted in chunks and each chunk is
+    written directly.
+
+    Parameters
+    ----------
+    obj : dict (object-wavefront-dict or columnar object-wavefront-dict)
         The object-wavefront to be serialized.
+    path_or_handle : str, os.PathLike, or file-handle
+        The path to write to, or an open handle in either text or binary
+        mode.
+    float_format : str
+        The format-string for the floats in 'v' and 'vn'. Use '{}' for the
+        shortest representation which reads back to the identical float.
+    chunk_size : int
+        The number of lines formatted at once.
     """
+    with _file.open_text_writer(path_or_handle) as write:
+        for chunk in _iter_dumps(
+            obj=obj, float_format=float_format, chunk_size=chunk_size
+        ):
+            write(chunk)
 
+
+def _iter_dumps(obj, float_format="{:f}", chunk_size=65536):
     IN_OBJ_INDEX_STARTS_WITH_1 = 1
 
-    s = io.StringIO()
-    s.write("# vertices\n")
-    for v in obj["v"]:
-        s.write("v {:f} {:f} {:f}\n".format(v[0], v[1], v[2]))
-    s.write("# vertex-normals\n")
-    for vn in obj["vn"]:
-        s.write("vn {:f} {:f} {:f}\n".format(vn[0], vn[1], vn[2]))
-    s.write("# faces\n")
-
-    for mtl in obj["mtl"]:
-        s.write("usemtl {:s}\n".format(mtl))
-        for f in obj["mtl"][mtl]:
-            s.write(
-                "f {:d}//{:d} {:d}//{:d} {:d}//{:d}\n".format(
-                    IN_OBJ_INDEX_STARTS_WITH_1 + f["v"][0],
-                    IN_OBJ_INDEX_STARTS_WITH_1 + f["vn"][0],
-                    IN_OBJ_INDEX_STARTS_WITH_1 + f["v"][1],
-                    IN_OBJ_INDEX_STARTS_WITH_1 + f["vn"][1],
-                    IN_OBJ_INDEX_STARTS_WITH_1 + f["v"][2],
-                    IN_OBJ_INDEX_STARTS_WITH_1 + f["vn"][2],
-                )
-            )
-    s.seek(0)
-    return s.read()
+    if "fv" not in obj:
+        obj = obj_to_columnar(obj)
+
+    v_line_format = "v {:s} {:s} {:s}\n".format(*([float_format] * 3))
+    vn_line_format = "vn {:s} {:s} {:s}\n".format(*([float_format] * 3))
+    f_line_format = "f {:d}//{:d} {:d}//{:d} {:d}//{:d}\n"
+
+    yield "# vertices\n"
+    yield from _file.iter_formatted_rows(
+        line_format=v_line_format,
+        rows=np.asarray(obj["v"], dtype=float),
+        chunk_size=chunk_size,
+    )
+    yield "# vertex-normals\n"
+    yield from _file.iter_formatted_rows(
+        line_format=vn_line_format,
+        rows=np.asarray(obj["vn"], dtype=float),
+        chunk_size=chunk_size,
+    )
+    yield "# faces\n"
+
+    fv = np.asarray(obj["fv"], dtype=int)
+    fvn = np.asarray(obj["fvn"], dtype=int)
+    for mtlkey in obj["mtl"]:
+        start, stop = obj["mtl"][mtlkey]
+        yield "usemtl {:s}\n".format(mtlkey)
+        f = np.zeros(shape=(stop - start, 6), dtype=int)
+        f[:, 0::2] = IN_OBJ_INDEX_STARTS_WITH_1 + fv[start:stop]
+        f[:, 1::2] = IN_OBJ_INDEX_STARTS_WITH_1 + fvn[start:stop]
+        yield from _file.iter_formatted_rows(
+            line_format=f_line_format,
+            rows=f,
+            chunk_size=chunk_size,
+        )
 
 
 def _vector_from_line(key, line):
@@ -123,59 +166,192 @@ def _face_from_line(line):
     return {"v": [v1, v2, v3], "vn": [vn1, vn2, vn3]}
 
 
-def loads(s):
+def init_columnar():
     """
-    Deserializes a wavefront-object-dict from a string 's'.
+    Returns an empty columnar object-wavefront-dict.
+
+    Unlike the object-wavefront-dict, the columnar dict holds its vertices,
+    vertex-normals, and faces in numpy arrays. The faces of all materials are
+    stored in one array and each material 'mtl' references a range
+    [start, stop) of faces.
+    """
+    return {
+        "v": np.zeros(shape=(0, 3), dtype=float),
+        "vn": np.zeros(shape=(0, 3), dtype=float),
+        "fv": np.zeros(shape=(0, 3), dtype=int),
+        "fvn": np.zeros(shape=(0, 3), dtype=int),
+        "mtl": {},
+    }
+
+
+def _numbers_from_text(text, dtype):
+    try:
+        return np.fromstring(text, dtype=dtype, sep=" ")
+    except ValueError:
+        # text contains tokens which are not numbers.
+        return np.zeros(shape=0, dtype=dtype)
+
+
+def _vectors_from_payloads(key, payloads):
+    num = len(payloads)
+    text = "\n".join(payloads)
+    num_tokens = _file.num_tokens_per_line(str.encode(text), num_lines=num)
+    if np.all(num_tokens == 3):
+        vectors = _numbers_from_text(text=text, dtype=float)
+        if vectors.shape[0] == 3 * num:
+            return vectors.reshape((num, 3))
+
+    # Not all lines have exactly three components. Fall back to parse
+    # line by line.
+    vectors = np.zeros(shape=(num, 3), dtype=float)
+    for i in range(num):
+        vectors[i] = _vector_from_line(key, key + " " + payloads[i])
+    return vectors
+
+
+def _faces_from_payloads(payloads):
+    IN_OBJ_INDEX_STARTS_WITH_1 = 1
+    num = len(payloads)
+    fv = np.zeros(shape=(num, 3), dtype=int)
+    fvn = np.zeros(shape=(num, 3), dtype=int)
+    if num == 0:
+        return fv, fvn
+
+    text = "\n".join(payloads)
+    num_blocks = _file.num_tokens_per_line(str.encode(text), num_lines=num)
+    if np.all(num_blocks == 3) and str.count(text, "/") == 6 * num:
+        text = str.replace(text, "/", " ")
+        num_indices = _file.num_tokens_per_line(
+            str.encode(text), num_lines=num
+        )
+        indices = _numbers_from_text(text=text, dtype=int)
+        if np.all(num_indices == 6) and indices.shape[0] == 6 * num:
+            # f v//vn v//vn v//vn
+            indices = indices.reshape((num, 6))
+            fv[:, :] = indices[:, [0, 2, 4]]
+            fvn[:, :] = indices[:, [1, 3, 5]]
+            fv -= IN_OBJ_INDEX_STARTS_WITH_1
+            fvn -= IN_OBJ_INDEX_STARTS_WITH_1
+            return fv, fvn
+        if np.all(num_indices == 9) and indices.shape[0] == 9 * num:
+            # f v/vt/vn v/vt/vn v/vt/vn
+            indices = indices.reshape((num, 9))
+            fv[:, :] = indices[:, [0, 3, 6]]
+            fvn[:, :] = indices[:, [2, 5, 8]]
+            fv -= IN_OBJ_INDEX_STARTS_WITH_1
+            fvn -= IN_OBJ_INDEX_STARTS_WITH_1
+            return fv, fvn
+
+    # Irregular faces. Fall back to parse line by line.
+    for i in range(num):
+        face = _face_from_line("f " + payloads[i])
+        fv[i] = face["v"]
+        fvn[i] = face["vn"]
+    return fv, fvn
+
+
+def loads_columnar(s):
+    """
+    Deserializes a columnar object-wavefront-dict from a string 's'.
+    The vertices, vertex-normals, and faces are tokenized in bulk.
+    See init_columnar().
 
     Parameters
     ----------
     s : str
         A string with the payload of an '.obj'-file.
     """
-    ss = io.StringIO()
-    ss.write(s)
-    ss.seek(0)
-    obj = init()
+    out = init_columnar()
 
-    mtl_is_open = False
-    mtlkey = None
-    mtl = []
-
-    while True:
-        line = ss.readline()
-        if not line:
-            if mtl_is_open:
-                obj["mtl"][mtlkey] = mtl
-            break
-        if str.startswith(line, "#"):
-            continue
-        if str.strip(line) == "\n":
-            continue
-
-        if str.startswith(line, "v "):
-            obj["v"].append(_vector_from_line("v", line))
-
-        if str.startswith(line, "vn "):
-            obj["vn"].append(_vector_from_line("vn", line))
-
-        if str.startswith(line, "usemtl "):
-            if mtl_is_open:
-                obj["mtl"][mtlkey] = mtl
-            else:
-                mtl_is_open = True
+    v_payloads = re.findall(r"^v (.*)$", s, flags=re.MULTILINE)
+    out["v"] = _vectors_from_payloads(key="v", payloads=v_payloads)
 
-            mtlkey = str.split(line, " ")[1]
-            mtlkey = str.strip(mtlkey, "\n")
-            mtl = []
+    vn_payloads = re.findall(r"^vn (.*)$", s, flags=re.MULTILINE)
+    out["vn"] = _vectors_from_payloads(key="vn", payloads=vn_payloads)
 
-        if str.startswith(line, "f "):
-            if mtl_is_open:
-                mtl.append(_face_from_line(line))
-            else:
-                raise AssertionError("Expected usemtl before first face 'f'.")
+    # blocks: [before first usemtl, mtlkey, block, mtlkey, block, ...]
+    blocks = re.split(r"^usemtl (.*)$", s, flags=re.MULTILINE)
+
+    if re.search(r"^f ", blocks[0], flags=re.MULTILINE):
+        raise AssertionError("Expected usemtl before first face 'f'.")
+
+    f_payloads = []
+    for i in range(1, len(blocks), 2):
+        mtlkey = str.split(blocks[i], " ")[0]
+        mtlkey = str.strip(mtlkey, "\r\n")
+        start = len(f_payloads)
+        f_payloads += re.findall(
+            r"^f (.*)$", blocks[i + 1], flags=re.MULTILINE
+        )
+        out["mtl"][mtlkey] = [start, len(f_payloads)]
+
+    out["fv"], out["fvn"] = _faces_from_payloads(payloads=f_payloads)
+    return out
+
+
+def columnar_to_obj(columnar):
+    """
+    Returns an object-wavefront-dict made from a columnar
+    object-wavefront-dict.
+
+    Parameters
+    ----------
+    columnar : dict (columnar object-wavefront-dict)
+        See init_columnar().
+    """
+    obj = init()
+    obj["v"] = np.asarray(columnar["v"], dtype=float).tolist()
+    obj["vn"] = np.asarray(columnar["vn"], dtype=float).tolist()
+
+    fv = np.asarray(columnar["fv"], dtype=int).tolist()
+    fvn = np.asarray(columnar["fvn"], dtype=int).tolist()
+    for mtlkey in columnar["mtl"]:
+        start, stop = columnar["mtl"][mtlkey]
+        obj["mtl"][mtlkey] = [
+            {"v": fv[i], "vn": fvn[i]} for i in range(start, stop)
+        ]
     return obj
 
 
+def obj_to_columnar(obj):
+    """
+    Returns a columnar object-wavefront-dict made from an
+    object-wavefront-dict.
+
+    Parameters
+    ----------
+    obj : dict (object-wavefront-dict)
+        See init().
+    """
+    out = init_columnar()
+    out["v"] = np.asarray(obj["v"], dtype=float).reshape((-1, 3))
+    out["vn"] = np.asarray(obj["vn"], dtype=float).reshape((-1, 3))
+
+    fv = []
+    fvn = []
+    for mtlkey in obj["mtl"]:
+        start = len(fv)
+        fv += [face["v"] for face in obj["mtl"][mtlkey]]
+        fvn += [face["vn"] for face in obj["mtl"][mtlkey]]
+        out["mtl"][mtlkey] = [start, len(fv)]
+
+    out["fv"] = np.asarray(fv, dtype=int).reshape((-1, 3))
+    out["fvn"] = np.asarray(fvn, dtype=int).reshape((-1, 3))
+    return out
+
+
+def loads(s):
+    """
+    Deserializes a wavefront-object-dict from a string 's'.
+
+    Parameters
+    ----------
+    s : str
+        A string with the payload of an '.obj'-file.
+    """
+    return columnar_to_obj(loads_columnar(s))
+
+
 def _angle_between_rad(a, b, eps=1e-9):
     na = np.linalg.norm(a)
     nb = np.linalg.norm(b)
@@ -8,9 +8,15 @@ A set of vertices and faces, but no vertex-normals.
 
 OFFs do not have groups or materials like OBJs.
 OFFs are indexed from zero, OBJs are indexed from one.
+
+The binary OFF starts with the line 'OFF BINARY' followed by big-endian
+int32 counts, float32 vertices, and int32 faces.
 """
 
+from . import _file
 import io
+import os
+import re
 import numpy as np
 
 
@@ -103,7 +109,7 @@ def diff(a, b, v_eps=1e-6):
     return diffs
 
 
-def dumps(off, float_format="{:e}"):
+def dumps(off, float_format="{:e}", mode="ascii"):
     """
     Returns an off-string dumped from an off-dictionary.
 
@@ -112,101 +118,357 @@ def dumps(off, float_format="{:e}"):
     off : off-dictionary
         Contains the vertices 'v' and faces 'f'.
     float_format : str
-        The format-string for floats.
+        Only for ascii. The format-string for floats.
+    mode : str
+        Either 't' / 'ascii' or 'b' / 'binary'. For binary, bytes are
+        returned.
+    """
+    if mode in ["t", "ascii"]:
+        return "".join(_iter_dumps_ascii(off=off, float_format=float_format))
+    elif mode in ["b", "binary"]:
+        ss = io.BytesIO()
+        _dump_binary(off=off, f=ss)
+        return ss.getvalue()
+    else:
+        raise KeyError("mode must be either 't' / 'ascii' or 'b' / 'binary'.")
+
+
+def dump(
+    off, path_or_handle, mode="ascii", float_format="{:e}", chunk_size=65536
+):
+    """
+    Writes an off-dictionary into a file. The vertices and faces are
+    formatted in chunks and each chunk is written directly.
+
+    Parameters
+    ----------
+    off : off-dictionary
+        Contains the vertices 'v' and faces 'f'.
+    path_or_handle : str, os.PathLike, or file-handle
+        The path to write to, or an open handle. For binary, the handle must
+        be in binary mode.
+    mode : str
+        Either 't' / 'ascii' or 'b' / 'binary'.
+    float_format : str
+        Only for ascii. The format-string for floats.
+    chunk_size : int
+        The number of vertices or faces written at once.
     """
-    s = io.StringIO()
-    s.write("OFF {:d} {:d} 0\n".format(len(off["v"]), len(off["f"])))
-    v_format = float_format + " " + float_format + " " + float_format + "\n"
+    if mode in ["t", "ascii"]:
+        with _file.open_text_writer(path_or_handle) as write:
+            for chunk in _iter_dumps_ascii(
+                off=off, float_format=float_format, chunk_size=chunk_size
+            ):
+                write(chunk)
+    elif mode in ["b", "binary"]:
+        with _file.open_binary_writer(path_or_handle) as f:
+            _dump_binary(off=off, f=f, chunk_size=chunk_size)
+    else:
+        raise KeyError("mode must be either 't' / 'ascii' or 'b' / 'binary'.")
 
-    for v in off["v"]:
-        s.write(v_format.format(v[0], v[1], v[2]))
 
-    for f in off["f"]:
-        s.write("3 {:d} {:d} {:d}\n".format(f[0], f[1], f[2]))
+def _iter_dumps_ascii(off, float_format="{:e}", chunk_size=65536):
+    v = np.asarray(off["v"], dtype=float).reshape((-1, 3))
+    f = np.asarray(off["f"], dtype=int).reshape((-1, 3))
 
-    s.seek(0)
-    return s.read()
+    yield "OFF {:d} {:d} 0\n".format(v.shape[0], f.shape[0])
+    yield from _file.iter_formatted_rows(
+        line_format="{f:s} {f:s} {f:s}\n".format(f=float_format),
+        rows=v,
+        chunk_size=chunk_size,
+    )
+    yield from _file.iter_formatted_rows(
+        line_format="3 {:d} {:d} {:d}\n",
+        rows=f,
+        chunk_size=chunk_size,
+    )
 
 
-def loads(s):
+def loads(s, mode="ascii"):
     """
     Returns an off-dictionary parsed from an off-string 's'.
 
     Parameters
     ----------
-    s : off-str
-        The string containing the object-file.
+    s : off-str or bytes
+        The string containing the object-file. Bytes for binary.
+    mode : str
+        Either 't' / 'ascii' or 'b' / 'binary'. For binary, 'v' and 'f'
+        are read-only views with big-endian dtypes on the bytes 's'.
+    """
+    if mode in ["t", "ascii"]:
+        return _loads_ascii(s=s)
+    elif mode in ["b", "binary"]:
+        return _loads_binary(s=s)
+    else:
+        raise KeyError("mode must be either 't' / 'ascii' or 'b' / 'binary'.")
+
+
+def load(path, mode="ascii", mmap=False):
+    """
+    Returns an off-dictionary loaded from the file in 'path'.
+
+    Parameters
+    ----------
+    path : str
+        Path to the OFF-file.
+    mode : str
+        Either 't' / 'ascii' or 'b' / 'binary'.
+    mmap : bool
+        Only for binary. If True, 'v' and 'f' are read-only views with
+        big-endian dtypes on a numpy.memmap of the file. The vertices and
+        faces are read from the file only when they are accessed.
     """
-    lines = str.splitlines(s)
-    num_lines = len(lines)
+    if mode in ["t", "ascii"]:
+        with open(path, "rt") as f:
+            return _loads_ascii(s=f.read())
+    elif mode in ["b", "binary"]:
+        if mmap:
+            return _load_binary_mmap(path=path)
+        with open(path, "rb") as f:
+            return _loads_binary(s=f.read())
+    else:
+        raise KeyError("mode must be either 't' / 'ascii' or 'b' / 'binary'.")
+
+
+def _loads_ascii(s):
+    header = re.search(r"^[ \t]*OFF\b([^\n]*)\n?", s, flags=re.MULTILINE)
+    if header is None:
+        raise AssertionError("Expected 'OFF' in header.")
+
+    # Only lines with payload remain. One line for each vertex and face.
+    body = re.sub(
+        r"^[ \t]*(#[^\n]*)?\r?\n",
+        "",
+        s[header.end() :] + "\n",
+        flags=re.MULTILINE,
+    )
+
+    counts = str.split(header.group(1))
+    if len(counts) == 0:
+        # The counts are on the line after 'OFF'.
+        end_of_counts = str.find(body, "\n")
+        counts = str.split(body[:end_of_counts])
+        body = body[end_of_counts + 1 :]
+    num_vertices = int(counts[0])
+    num_faces = int(counts[1])
+
+    body = str.encode(body)
+    line_ends = np.flatnonzero(
+        np.frombuffer(body, dtype=np.uint8) == ord("\n")
+    )
+    if line_ends.shape[0] < num_vertices + num_faces:
+        raise AssertionError(
+            "Expected {:d} vertices and {:d} faces, "
+            "but found only {:d} lines.".format(
+                num_vertices, num_faces, line_ends.shape[0]
+            )
+        )
+    line_starts = np.concatenate([[0], line_ends + 1])
+    face_start = line_starts[num_vertices]
+    face_stop = line_starts[num_vertices + num_faces]
+
+    num_tokens = _file.num_tokens_per_line(
+        body[:face_start], num_lines=num_vertices
+    )
+    if np.any(num_tokens != 3):
+        raise AssertionError(
+            "Expected vertex #{:d} to have 3 numbers.".format(
+                np.flatnonzero(num_tokens != 3)[0]
+            )
+        )
 
     off = init()
-    num_vertices = 0
-    num_faces = 0
-    num_edges = 0
-    found_off = False
-
-    for ln in range(len(lines)):
-        line = lines[ln]
-        sline = str.strip(line)
-
-        if len(sline) == 0:
-            continue
-
-        if "#" == sline[0]:
-            continue
-
-        if sline[0:3] == "OFF":
-            found_off = True
-            off_line = str.replace(sline, "OFF", "")
-            off_line = str.strip(off_line)
-            off_tokens = str.split(off_line, " ")
-            num_vertices = int(off_tokens[0])
-            num_faces = int(off_tokens[1])
-            num_edges = int(off_tokens[2])
-
-        if found_off:
-            break
-
-    idx_vertex = 0
-    while (ln + 1) < num_lines and idx_vertex < num_vertices:
-        ln += 1
-        line = lines[ln]
-        sline = str.strip(line)
-
-        if len(sline) == 0:
-            continue
-
-        if "#" == sline[0]:
-            continue
-
-        vertex_tokens = str.split(sline, " ")
-        vertex = [float(token) for token in vertex_tokens]
-        off["v"].append(vertex)
-        idx_vertex += 1
-
-    idx_face = 0
-    while (ln + 1) < num_lines and idx_face < num_faces:
-        ln += 1
-        line = lines[ln]
-        sline = str.strip(line)
-
-        if len(sline) == 0:
-            continue
-
-        if "#" == sline[0]:
-            continue
-
-        face_tokens = str.split(sline, " ")
-        num_vertices_in_face = int(face_tokens[0])
-        assert num_vertices_in_face == 3
-        face_tokens = face_tokens[1:4]
-        face = [int(token) for token in face_tokens]
-        off["f"].append(face)
-        idx_face += 1
+    off["v"] = _numbers_from_text(
+        text=body[:face_start], dtype=float, num=3 * num_vertices
+    ).reshape((num_vertices, 3))
 
+    off["f"] = _faces_from_text(
+        text=body[face_start:face_stop], num_faces=num_faces
+    )
     return off
 
 
+def _faces_from_text(text, num_faces):
+    """
+    Returns the faces (num_faces, 3) parsed from the lines of the face
+    block. When the lines have more than the four tokens
+    '3 v0 v1 v2', e.g. colors or trailing comments, only the first
+    four tokens of each line are read.
+    """
+    num_tokens = _file.num_tokens_per_line(text, num_lines=num_faces)
+    if np.all(num_tokens == 4):
+        f = _numbers_from_text(text=text, dtype=int, num=4 * num_faces)
+        f = f.reshape((num_faces, 4))
+    else:
+        f = np.zeros(shape=(num_faces, 4), dtype=int)
+        lines = bytes.splitlines(text)
+        for i in range(num_faces):
+            tokens = bytes.split(lines[i])
+            if len(tokens) < 4:
+                raise AssertionError(
+                    "Expected face #{:d} to have 4 numbers.".format(i)
+                )
+            f[i, 0] = int(tokens[0])
+            f[i, 1:4] = [int(token) for token in tokens[1:4]]
+
+    if np.any(f[:, 0] != 3):
+        raise AssertionError("Expected all faces to have three vertices.")
+    return f[:, 1:4]
+
+
+def _numbers_from_text(text, dtype, num):
+    try:
+        numbers = np.fromstring(text, dtype=dtype, sep=" ")
+    except ValueError:
+        # text contains tokens which are not numbers.
+        numbers = np.zeros(shape=0, dtype=dtype)
+    if numbers.shape[0] != num:
+        raise AssertionError(
+            "Expected {:d} numbers, but found {:d}.".format(
+                num, numbers.shape[0]
+            )
+        )
+    return numbers
+
+
+_BINARY_FLOAT = np.dtype(">f4")
+_BINARY_INT = np.dtype(">i4")
+_BINARY_NUM_INTS_PER_FACE = 5
+
+
+def _binary_layout(head, num_bytes):
+    """
+    Returns the number of vertices, the offset of the vertex block, the
+    number of faces, and the offset of the face block in a binary OFF.
+
+    In the face block, each face is: 3, three vertex indices, and zero
+    colors. All are big-endian int32.
+
+    Parameters
+    ----------
+    head : bytes
+        The first bytes of the binary OFF. At least the header line and the
+        three counts.
+    num_bytes : int
+        The total number of bytes in the binary OFF.
+    """
+    end_of_header_line = bytes.find(head, b"\n")
+    if bytes.split(head[:end_of_header_line]) != [b"OFF", b"BINARY"]:
+        raise AssertionError("Expected header 'OFF BINARY'.")
+    counts_offset = end_of_header_line + 1
+    if len(head) < counts_offset + 3 * _BINARY_INT.itemsize:
+        raise AssertionError("Expected counts of vertices, faces and edges.")
+    num_vertices, num_faces, _num_edges = [
+        int(c)
+        for c in np.frombuffer(
+            head, dtype=_BINARY_INT, count=3, offset=counts_offset
+        )
+    ]
+    if num_vertices < 0 or num_faces < 0:
+        raise AssertionError(
+            "Expected non negative counts of vertices and faces, "
+            "but got {:d} and {:d}.".format(num_vertices, num_faces)
+        )
+
+    vertex_offset = counts_offset + 3 * _BINARY_INT.itemsize
+    face_offset = vertex_offset + num_vertices * 3 * _BINARY_FLOAT.itemsize
+    expected_num_bytes = (
+        face_offset
+        + num_faces * _BINARY_NUM_INTS_PER_FACE * _BINARY_INT.itemsize
+    )
+    if num_bytes < expected_num_bytes:
+        raise AssertionError(
+            "Expected binary OFF with {:d} vertices and {:d} triangles to "
+            "have at least {:d} bytes, but it has {:d}.".format(
+                num_vertices, num_faces, expected_num_bytes, num_bytes
+            )
+        )
+    return num_vertices, vertex_offset, num_faces, face_offset
+
+
+def _init_from_binary_blocks(v, f):
+    if np.any(f[:, 0] != 3):
+        raise AssertionError("Expected all faces to have three vertices.")
+    if np.any(f[:, 4] != 0):
+        raise AssertionError("Expected faces to have no colors.")
+    off = init()
+    off["v"] = v
+    off["f"] = f[:, 1:4]
+    return off
+
+
+def _loads_binary(s):
+    num_vertices, vertex_offset, num_faces, face_offset = _binary_layout(
+        head=s, num_bytes=len(s)
+    )
+    v = np.frombuffer(
+        s, dtype=_BINARY_FLOAT, count=3 * num_vertices, offset=vertex_offset
+    )
+    f = np.frombuffer(
+        s,
+        dtype=_BINARY_INT,
+        count=_BINARY_NUM_INTS_PER_FACE * num_faces,
+        offset=face_offset,
+    )
+    return _init_from_binary_blocks(
+        v=v.reshape((num_vertices, 3)),
+        f=f.reshape((num_faces, _BINARY_NUM_INTS_PER_FACE)),
+    )
+
+
+def _load_binary_mmap(path):
+    MAX_NUM_BYTES_HEAD = 1024
+    with open(path, "rb") as fin:
+        head = fin.read(MAX_NUM_BYTES_HEAD)
+    num_vertices, vertex_offset, num_faces, face_offset = _binary_layout(
+        head=head, num_bytes=os.path.getsize(path)
+    )
+    return _init_from_binary_blocks(
+        v=_memmap_or_empty(
+            path=path,
+            dtype=_BINARY_FLOAT,
+            offset=vertex_offset,
+            shape=(num_vertices, 3),
+        ),
+        f=_memmap_or_empty(
+            path=path,
+            dtype=_BINARY_INT,
+            offset=face_offset,
+            shape=(num_faces, _BINARY_NUM_INTS_PER_FACE),
+        ),
+    )
+
+
+def _memmap_or_empty(path, dtype, offset, shape):
+    if shape[0] == 0:
+        # An empty map can not be created.
+        return np.frombuffer(b"", dtype=dtype).reshape(shape)
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+
+def _dump_binary(off, f, chunk_size=65536):
+    v = np.asarray(off["v"]).reshape((-1, 3))
+    faces = np.asarray(off["f"]).reshape((-1, 3))
+
+    f.write(b"OFF BINARY\n")
+    f.write(
+        np.array([v.shape[0], faces.shape[0], 0], dtype=_BINARY_INT).tobytes()
+    )
+
+    for start in range(0, v.shape[0], chunk_size):
+        f.write(v[start : start + chunk_size].astype(_BINARY_FLOAT).data)
+
+    for start in range(0, faces.shape[0], chunk_size):
+        chunk = faces[start : start + chunk_size]
+        block = np.zeros(
+            shape=(chunk.shape[0], _BINARY_NUM_INTS_PER_FACE),
+            dtype=_BINARY_INT,
+        )
+        block[:, 0] = 3
+        block[:, 1:4] = chunk
+        f.write(block.data)
+
+
 def to_vertices_and_faces(off):
     return np.asarray(off["v"], dtype=float), np.asarray(off["f"], dtype=int)
@@ -8,9 +8,15 @@ Only a list of triangles. Not faces of a mesh.
 STL does not state anything about the relations of the facets.
 """
 
+from . import _file
 import io
+import os
+import re
 import numpy as np
 
+_BINARY_HEADER_NUM_BYTES = 80
+_BINARY_COUNT_NUM_BYTES = 4
+
 
 def _dtype():
     return [
@@ -35,18 +41,19 @@ def diff(a, b, eps=1e-6):
     if len(a) != len(b):
         diffs.append(("len", len(a), len(b)))
 
-    for i in range(len(a)):
-        for key, _ in _dtype():
-            if key == "attribute_byte_count":
-                continue
-            if np.abs(a[key][i] - b[key][i]) > eps:
-                diffs.append(
-                    (
-                        "facet: {:d}, key: {:s}".format(i, key),
-                        a[key][i],
-                        b[key][i],
-                    )
-                )
+    num = min(len(a), len(b))
+    av = normals_and_vertices_view(a[0:num]).reshape((num, 12))
+    bv = normals_and_vertices_view(b[0:num]).reshape((num, 12))
+    keys = [key for key, _ in _dtype()[0:12]]
+
+    for i, k in zip(*np.nonzero(np.abs(av - bv) > eps)):
+        diffs.append(
+            (
+                "facet: {:d}, key: {:s}".format(i, keys[k]),
+                av[i, k],
+                bv[i, k],
+            )
+        )
     return diffs
 
 
@@ -83,29 +90,13 @@ def minimal():
             [3, 4, 1],
         ]
     )
-    out = init(size=len(faces))
-    for i in range(len(faces)):
-        out["vertex-0.x"][i] = vertices[faces[i, 0], 0]
-        out["vertex-0.y"][i] = vertices[faces[i, 0], 1]
-        out["vertex-0.z"][i] = vertices[faces[i, 0], 2]
-        out["vertex-1.x"][i] = vertices[faces[i, 1], 0]
-        out["vertex-1.y"][i] = vertices[faces[i, 1], 1]
-        out["vertex-1.z"][i] = vertices[faces[i, 1], 2]
-        out["vertex-2.x"][i] = vertices[faces[i, 2], 0]
-        out["vertex-2.y"][i] = vertices[faces[i, 2], 1]
-        out["vertex-2.z"][i] = vertices[faces[i, 2], 2]
-
-        e01 = vertices[faces[i, 0]] - vertices[faces[i, 1]]
-        e12 = vertices[faces[i, 1]] - vertices[faces[i, 2]]
-        n = np.cross(e01, e12)
-
-        out["normal.x"][i] = n[0]
-        out["normal.y"][i] = n[1]
-        out["normal.z"][i] = n[2]
-
-        out["attribute_byte_count"][i] = 0
+    e01 = vertices[faces[:, 0]] - vertices[faces[:, 1]]
+    e12 = vertices[faces[:, 1]] - vertices[faces[:, 2]]
+    normals = np.cross(e01, e12)
 
-    return out
+    return init_from_vertices_and_normals(
+        vertices=vertices[faces], normals=normals
+    )
 
 
 def init(size=0):
@@ -115,6 +106,92 @@ def init(size=0):
     return np.recarray(shape=size, dtype=_dtype())
 
 
+def init_from_vertices_and_normals(vertices, normals=None):
+    """
+    Returns triangles with dtype=_dtype() packed from the arrays of
+    'vertices' and 'normals'.
+
+    Parameters
+    ----------
+    vertices : array like, float, shape(N, 3, 3)
+        The three vertices of each triangle.
+    normals : array like, float, shape(N, 3) (default: None)
+        The surface-normal of each triangle. If None, the unit normals are
+        computed from the vertices.
+    """
+    vertices = np.asarray(vertices)
+    assert vertices.ndim == 3
+    assert vertices.shape[1] == 3
+    assert vertices.shape[2] == 3
+
+    if normals is None:
+        normals = _make_normals_from_vertices(vertices=vertices)
+    normals = np.asarray(normals)
+    assert normals.shape == (vertices.shape[0], 3)
+
+    out = init(size=vertices.shape[0])
+    normals_and_vertices = normals_and_vertices_view(out)
+    normals_and_vertices[:, 0, :] = normals
+    normals_and_vertices[:, 1:4, :] = vertices
+    out["attribute_byte_count"] = 0
+    return out
+
+
+def _float32_view(stl, first_key, shape):
+    assert stl.dtype == np.dtype(_dtype())
+    assert stl.ndim == 1
+    FLOAT32_NUM_BYTES = 4
+    return np.lib.stride_tricks.as_strided(
+        stl[first_key],
+        shape=(stl.shape[0], shape[0], shape[1]),
+        strides=(
+            stl.strides[0],
+            shape[1] * FLOAT32_NUM_BYTES,
+            FLOAT32_NUM_BYTES,
+        ),
+    )
+
+
+def vertices_view(stl):
+    """
+    Returns a view with shape (N, 3, 3) on the float32 vertices of the
+    triangles 'stl'. No data is copied. Writing to the view writes to 'stl'.
+
+    Parameters
+    ----------
+    stl : numpy.recarray with dtype=_dtype()
+        The triangles.
+    """
+    return _float32_view(stl=stl, first_key="vertex-0.x", shape=(3, 3))
+
+
+def normals_view(stl):
+    """
+    Returns a view with shape (N, 3) on the float32 surface-normals of the
+    triangles 'stl'. No data is copied. Writing to the view writes to 'stl'.
+
+    Parameters
+    ----------
+    stl : numpy.recarray with dtype=_dtype()
+        The triangles.
+    """
+    return _float32_view(stl=stl, first_key="normal.x", shape=(1, 3))[:, 0]
+
+
+def normals_and_vertices_view(stl):
+    """
+    Returns a view with shape (N, 4, 3) on the float32 surface-normal
+    [:, 0, :] and the three vertices [:, 1:4, :] of the triangles 'stl'.
+    No data is copied. Writing to the view writes to 'stl'.
+
+    Parameters
+    ----------
+    stl : numpy.recarray with dtype=_dtype()
+        The triangles.
+    """
+    return _float32_view(stl=stl, first_key="normal.x", shape=(4, 3))
+
+
 def _num_bytes_per_triangle():
     return len(init(size=1).tobytes())
 
@@ -128,185 +205,489 @@ def loads(s, mode="ascii"):
         raise KeyError("mode must be either 'ascii' or 'binary'.")
 
 
-def dumps(stl, mode="ascii"):
+def dumps(stl, mode="ascii", float_format="{:e}"):
     if mode in ["t", "ascii"]:
-        return _dumps_ascii(stl=stl)
+        return _dumps_ascii(stl=stl, float_format=float_format)
     elif mode in ["b", "binary"]:
         return _dumps_binary(stl=stl)
     else:
         raise KeyError("mode must be either 't' / 'ascii' or 'b' / 'binary'.")
 
 
-def _gather_lines_of_facet(ss):
-    out = []
-    while True:
-        line = ss.readline()
-        if not line:
-            break
-        if "\n" == line:
-            continue
-        out.append(str.strip(line))
-        if "endfacet" in line:
-            break
-    return out
-
-
-def _facet_from_facet_lines(flines):
-    flines = [str.strip(ll) for ll in flines]
-    assert "facet normal" in flines[0]
-    normal = [float(n) for n in flines[0].split(" ")[2:]]
-    assert len(normal) == 3
-    assert "outer loop" in flines[1]
-    v = []
-    for i in range(3):
-        vi = [float(n) for n in flines[i + 2].split(" ")[1:]]
-        assert len(vi) == 3
-        v.append(vi)
-    return normal, v
-
-
-def _loads_ascii(s):
-    ss = io.StringIO()
-    ss.write(s)
-    ss.seek(0)
-
-    firstline = ss.readline()
-    assert firstline.startswith("solid ")
+def load(path, mode="ascii", mmap=False):
+    """
+    Returns the triangles loaded from the STL-file in 'path'.
+
+    Parameters
+    ----------
+    path : str
+        Path to the STL-file.
+    mode : str
+        Either 't' / 'ascii' or 'b' / 'binary'.
+    mmap : bool
+        Only for binary. If True, the triangles are not read but a
+        read-only numpy.memmap with dtype=_dtype() is returned which maps the
+        triangles in the file. Triangles are read from the file only when
+        they are accessed.
+    """
+    if mode in ["t", "ascii"]:
+        with open(path, "rt") as f:
+            return _loads_ascii(s=f.read())
+    elif mode in ["b", "binary"]:
+        if mmap:
+            return _load_binary_mmap(path=path)
+        with open(path, "rb") as f:
+            return _loads_binary(s=f.read())
+    else:
+        raise KeyError("mode must be either 't' / 'ascii' or 'b' / 'binary'.")
 
-    facets = []
 
-    while True:
-        line = ss.readline()
-        if not line:
-            break
-        if "facet normal" in line:
-            fll = [line]
-            fll += _gather_lines_of_facet(ss)
-            n, v = _facet_from_facet_lines(flines=fll)
+def dump(
+    stl, path_or_handle, mode="ascii", float_format="{:e}", chunk_size=16384
+):
+    """
+    Writes the triangles 'stl' into a file. The triangles are formatted and
+    written in chunks.
+
+    Parameters
+    ----------
+    stl : numpy.recarray with dtype=_dtype()
+        The triangles.
+    path_or_handle : str, os.PathLike, or file-handle
+        Where to write to. A handle for mode 'binary' must be in binary mode
+        and seekable.
+    mode : str
+        Either 't' / 'ascii' or 'b' / 'binary'.
+    float_format : str
+        Only for ascii. The format-string for the floats.
+    chunk_size : int
+        The number of triangles formatted and written at once.
+    """
+    if mode in ["t", "ascii"]:
+        with _file.open_text_writer(path_or_handle) as write:
+            for chunk in _iter_dumps_ascii(
+                stl=stl, float_format=float_format, chunk_size=chunk_size
+            ):
+                write(chunk)
+    elif mode in ["b", "binary"]:
+        with BinaryWriter(path_or_handle) as writer:
+            for start in range(0, len(stl), chunk_size):
+                writer.write(stl[start : start + chunk_size])
+    else:
+        raise KeyError("mode must be either 't' / 'ascii' or 'b' / 'binary'.")
 
-            facets.append((n, v))
 
-        elif "endsolid" in line:
-            break
-        else:
-            pass
+def _find_line_starts(pattern, s):
+    return np.array(
+        [m.start() for m in re.finditer(pattern, s, flags=re.MULTILINE)],
+        dtype=np.int64,
+    )
 
-    out = init(len(facets))
-    for i in range(len(facets)):
-        n, v = facets[i]
-        out["normal.x"][i] = n[0]
-        out["normal.y"][i] = n[1]
-        out["normal.z"][i] = n[2]
 
-        out["vertex-0.x"][i] = v[0][0]
-        out["vertex-0.y"][i] = v[0][1]
-        out["vertex-0.z"][i] = v[0][2]
+def _loads_ascii(s):
+    if not str.startswith(s, "solid "):
+        raise AssertionError("Expected ascii STL to start with 'solid '.")
+
+    endsolid = re.search(r"^\s*endsolid", s, flags=re.MULTILINE)
+    if endsolid:
+        s = s[: endsolid.start()]
+
+    THREE_NUMBERS = r"(\S+[ \t]+\S+[ \t]+\S+)[ \t\r]*$"
+    normals = re.findall(
+        r"^\s*facet[ \t]+normal[ \t]+" + THREE_NUMBERS,
+        s,
+        flags=re.MULTILINE,
+    )
+    vertices = re.findall(
+        r"^\s*vertex[ \t]+" + THREE_NUMBERS,
+        s,
+        flags=re.MULTILINE,
+    )
+    num_facets = len(normals)
 
-        out["vertex-1.x"][i] = v[1][0]
-        out["vertex-1.y"][i] = v[1][1]
-        out["vertex-1.z"][i] = v[1][2]
+    facet_starts = _find_line_starts(r"^[ \t]*facet[ \t]", s)
+    outer_loop_starts = _find_line_starts(r"^[ \t]*outer[ \t]+loop", s)
+    vertex_starts = _find_line_starts(r"^[ \t]*vertex[ \t]", s)
+    endloop_starts = _find_line_starts(r"^[ \t]*endloop", s)
+    endfacet_starts = _find_line_starts(r"^[ \t]*endfacet", s)
 
-        out["vertex-2.x"][i] = v[2][0]
-        out["vertex-2.y"][i] = v[2][1]
-        out["vertex-2.z"][i] = v[2][2]
+    if facet_starts.shape[0] != num_facets:
+        raise AssertionError(
+            "Expected each 'facet normal' to have three numbers."
+        )
+    if vertex_starts.shape[0] != len(vertices):
+        raise AssertionError("Expected each 'vertex' to have three numbers.")
+    if len(vertices) != 3 * num_facets:
+        raise AssertionError("Expected three vertices in each facet.")
+    for name, starts in [
+        ("outer loop", outer_loop_starts),
+        ("endloop", endloop_starts),
+        ("endfacet", endfacet_starts),
+    ]:
+        if starts.shape[0] != num_facets:
+            raise AssertionError(
+                "Expected one '{:s}' in each facet.".format(name)
+            )
 
-    return out
+    # Each facet is: facet normal, outer loop, three vertices, endloop, and
+    # endfacet. So the keywords must appear in exactly this order.
+    facets = np.c_[
+        facet_starts,
+        outer_loop_starts,
+        vertex_starts.reshape((num_facets, 3)),
+        endloop_starts,
+        endfacet_starts,
+    ]
+    if np.any(np.diff(facets.ravel()) <= 0):
+        raise AssertionError(
+            "Expected each facet to have the lines 'facet normal', "
+            "'outer loop', three 'vertex', 'endloop', and 'endfacet'."
+        )
 
+    return init_from_vertices_and_normals(
+        vertices=_floats_from_ascii(vertices, num=9 * num_facets).reshape(
+            (num_facets, 3, 3)
+        ),
+        normals=_floats_from_ascii(normals, num=3 * num_facets).reshape(
+            (num_facets, 3)
+        ),
+    )
 
-def _dumps_ascii(stl):
-    ss = io.StringIO()
-    ss.write("solid \n")
 
-    for i in range(len(stl)):
-        ss.write(
-            "facet normal {:e} {:e} {:e}\n".format(
-                stl["normal.x"][i],
-                stl["normal.y"][i],
-                stl["normal.z"][i],
-            )
+def _floats_from_ascii(lines, num):
+    try:
+        floats = np.fromstring(" ".join(lines), dtype=float, sep=" ")
+    except ValueError:
+        # lines contain tokens which are not numbers.
+        floats = np.zeros(shape=0, dtype=float)
+    if floats.shape[0] != num:
+        raise AssertionError("Expected {:d} numbers.".format(num))
+    return floats
+
+
+def _dumps_ascii(stl, float_format="{:e}"):
+    return "".join(_iter_dumps_ascii(stl=stl, float_format=float_format))
+
+
+def _iter_dumps_ascii(stl, float_format="{:e}", chunk_size=16384):
+    facet_format = (
+        "facet normal {f:s} {f:s} {f:s}\n"
+        "    outer loop\n"
+        "        vertex {f:s} {f:s} {f:s}\n"
+        "        vertex {f:s} {f:s} {f:s}\n"
+        "        vertex {f:s} {f:s} {f:s}\n"
+        "    endloop\n"
+        "endfacet\n"
+    ).format(f=float_format)
+
+    yield "solid \n"
+    for start in range(0, len(stl), chunk_size):
+        chunk = stl[start : start + chunk_size]
+        normals_and_vertices = normals_and_vertices_view(chunk).reshape(
+            (len(chunk), 12)
         )
-        ss.write("    outer loop\n")
-        ss.write(
-            "        vertex {:e} {:e} {:e}\n".format(
-                stl["vertex-0.x"][i],
-                stl["vertex-0.y"][i],
-                stl["vertex-0.z"][i],
-            )
+        yield from _file.iter_formatted_rows(
+            line_format=facet_format,
+            rows=normals_and_vertices,
+            chunk_size=chunk_size,
         )
-        ss.write(
-            "        vertex {:e} {:e} {:e}\n".format(
-                stl["vertex-1.x"][i],
-                stl["vertex-1.y"][i],
-                stl["vertex-1.z"][i],
-            )
+    yield "endsolid \n"
+
+
+def _num_triangles_from_binary_head(head, num_bytes):
+    """
+    Returns the number of triangles stated in the 'head' of a binary STL.
+    Asserts that the STL's 'num_bytes' can hold this many triangles.
+
+    Parameters
+    ----------
+    head : bytes
+        At least the first 84 bytes of the binary STL, i.e. the 80 bytes of
+        the header and the 4 bytes of the number of triangles.
+    num_bytes : int
+        The total number of bytes in the binary STL.
+    """
+    NUM_BYTES_HEAD = _BINARY_HEADER_NUM_BYTES + _BINARY_COUNT_NUM_BYTES
+    if len(head) < NUM_BYTES_HEAD:
+        raise AssertionError(
+            "Expected binary STL to have at least {:d} bytes, "
+            "but it has {:d}.".format(NUM_BYTES_HEAD, len(head))
         )
-        ss.write(
-            "        vertex {:e} {:e} {:e}\n".format(
-                stl["vertex-2.x"][i],
-                stl["vertex-2.y"][i],
-                stl["vertex-2.z"][i],
+    num_triangles = int(
+        np.frombuffer(
+            head,
+            dtype=np.uint32,
+            count=1,
+            offset=_BINARY_HEADER_NUM_BYTES,
+        )[0]
+    )
+    expected_num_bytes = (
+        NUM_BYTES_HEAD + num_triangles * _num_bytes_per_triangle()
+    )
+    if num_bytes < expected_num_bytes:
+        raise AssertionError(
+            "Expected binary STL with {:d} triangles to have at least "
+            "{:d} bytes, but it has {:d}.".format(
+                num_triangles, expected_num_bytes, num_bytes
             )
         )
-        ss.write("    endloop\n")
-        ss.write("endfacet\n")
-    ss.write("endsolid \n")
-
-    ss.seek(0)
-    return ss.read()
+    return num_triangles
 
 
 def _loads_binary(s):
-    NUM_BYTES_PER_TRIANGLE = _num_bytes_per_triangle()
-    ss = io.BytesIO()
-    ss.write(s)
-    ss.seek(0)
-    _header = ss.read(80)
-    num_triangles = np.frombuffer(ss.read(4), dtype=np.uint32)[0]
+    num_triangles = _num_triangles_from_binary_head(head=s, num_bytes=len(s))
     return np.frombuffer(
-        ss.read(NUM_BYTES_PER_TRIANGLE * num_triangles), dtype=_dtype()
+        s,
+        dtype=_dtype(),
+        count=num_triangles,
+        offset=_BINARY_HEADER_NUM_BYTES + _BINARY_COUNT_NUM_BYTES,
+    )
+
+
+def _load_binary_mmap(path):
+    NUM_BYTES_HEAD = _BINARY_HEADER_NUM_BYTES + _BINARY_COUNT_NUM_BYTES
+    with open(path, "rb") as f:
+        head = f.read(NUM_BYTES_HEAD)
+    num_triangles = _num_triangles_from_binary_head(
+        head=head, num_bytes=os.path.getsize(path)
     )
+    if num_triangles == 0:
+        # An empty map can not be created.
+        return np.frombuffer(b"", dtype=_dtype())
+    return np.memmap(
+        path,
+        dtype=_dtype(),
+        mode="r",
+        offset=NUM_BYTES_HEAD,
+        shape=(num_triangles,),
+    )
+
+
+def _read_binary_head(f):
+    NUM_BYTES_HEAD = _BINARY_HEADER_NUM_BYTES + _BINARY_COUNT_NUM_BYTES
+    num_bytes = _file.num_bytes_remaining(f)
+    head = f.read(NUM_BYTES_HEAD)
+    return _num_triangles_from_binary_head(head=head, num_bytes=num_bytes)
+
+
+def num_triangles_in_binary(path_or_handle):
+    """
+    Returns the number of triangles in a binary STL.
+
+    Parameters
+    ----------
+    path_or_handle : str, os.PathLike, or file-handle
+        The binary STL. A handle must be seekable and be positioned at the
+        beginning of the STL.
+    """
+    with _file.open_binary_reader(path_or_handle) as f:
+        start = f.tell()
+        num_triangles = _read_binary_head(f)
+        f.seek(start)
+    return num_triangles
+
+
+def iter_binary_blocks(path_or_handle, block_size=65536):
+    """
+    Yields blocks of triangles from a binary STL without reading all
+    triangles into memory at once. Each block is a numpy.ndarray with
+    dtype=_dtype() and at most 'block_size' triangles.
+
+    The blocks are read into one buffer which is reused for every block.
+    A yielded block is only valid until the next block is requested.
+    Copy it in case it is needed later.
+
+    Parameters
+    ----------
+    path_or_handle : str, os.PathLike, or file-handle
+        The binary STL. A handle must be seekable and be positioned at the
+        beginning of the STL.
+    block_size : int
+        The maximum number of triangles in a block.
+    """
+    assert block_size > 0
+    with _file.open_binary_reader(path_or_handle) as f:
+        num_triangles = _read_binary_head(f)
+        buff = np.zeros(shape=min(block_size, num_triangles), dtype=_dtype())
+
+        num_yielded = 0
+        while num_yielded < num_triangles:
+            num = min(block_size, num_triangles - num_yielded)
+            block = buff[:num]
+            _file.readinto_exactly(f=f, buff=block)
+            num_yielded += num
+            yield block
+
+
+def read_binary_block(path_or_handle, start, num):
+    """
+    Returns the triangles [start, start + num) of a binary STL without
+    reading the other triangles. Like in slicing, the range is clipped to
+    the triangles present in the STL.
+
+    Parameters
+    ----------
+    path_or_handle : str, os.PathLike, or file-handle
+        The binary STL. A handle must be seekable and be positioned at the
+        beginning of the STL.
+    start : int
+        Index of the first triangle to be read.
+    num : int
+        Number of triangles to be read.
+    """
+    assert start >= 0
+    assert num >= 0
+    with _file.open_binary_reader(path_or_handle) as f:
+        stl_start = f.tell()
+        num_triangles = _read_binary_head(f)
+        start = min(start, num_triangles)
+        num = min(num, num_triangles - start)
+
+        out = np.zeros(shape=num, dtype=_dtype())
+        f.seek(
+            stl_start
+            + _BINARY_HEADER_NUM_BYTES
+            + _BINARY_COUNT_NUM_BYTES
+            + start * _num_bytes_per_triangle()
+        )
+        _file.readinto_exactly(f=f, buff=out)
+    return out
 
 
 def _dumps_binary(stl):
     ss = io.BytesIO()
+    with BinaryWriter(ss) as writer:
+        writer.write(stl)
+    return ss.getvalue()
 
-    ss.write(b" " * 80)
-    num_triangles = len(stl)
-    ss.write(np.uint32(num_triangles).tobytes())
-    ss.write(stl.tobytes())
-
-    ss.seek(0)
-    return ss.read()
 
+def _make_normals_from_vertices(vertices):
+    """
+    Returns the unit surface-normals of the triangles 'vertices' with
+    shape (N, 3, 3). Normals of degenerate triangles are zero.
+    """
+    n = np.cross(
+        vertices[:, 1, :] - vertices[:, 0, :],
+        vertices[:, 2, :] - vertices[:, 0, :],
+    )
+    norm = np.linalg.norm(n, axis=1)
+    valid = norm > 0.0
+    n[valid] /= norm[valid, np.newaxis]
+    return n
 
-def to_vertices_and_faces(stl):
-    num_faces = stl.shape[0]
-    num_vertices = 3 * num_faces
-    faces = np.zeros(shape=(num_faces, 3), dtype=int)
-    vertices = np.zeros(shape=(num_vertices, 3), dtype=float)
 
-    vi = 0
-    for fi in range(num_faces):
-        sface = stl[fi]
-        v0 = [sface["vertex-0.x"], sface["vertex-0.y"], sface["vertex-0.z"]]
-        v1 = [sface["vertex-1.x"], sface["vertex-1.y"], sface["vertex-1.z"]]
-        v2 = [sface["vertex-2.x"], sface["vertex-2.y"], sface["vertex-2.z"]]
+class BinaryWriter:
+    """
+    Writes a binary STL batch by batch without holding all its triangles in
+    memory. The number of triangles in the header is written when the
+    writer is closed.
+
+    with BinaryWriter(path) as writer:
+        writer.write(triangles)
+        writer.write(more_triangles)
+
+    Parameters
+    ----------
+    path_or_handle : str, os.PathLike, or file-handle
+        Where to write to. A handle must be in binary mode and seekable. It
+        will not be closed.
+    header : bytes
+        The first (at most 80) bytes in the STL. Padded with spaces.
+    """
 
-        vi0 = vi
-        vertices[vi] = v0
-        vi += 1
+    def __init__(self, path_or_handle, header=b""):
+        assert len(header) <= _BINARY_HEADER_NUM_BYTES
+        if _file.is_path(path_or_handle):
+            self.f = open(path_or_handle, "wb")
+            self.owns_f = True
+        else:
+            self.f = path_or_handle
+            self.owns_f = False
+
+        self.start = self.f.tell()
+        self.num_triangles = 0
+        self.f.write(bytes.ljust(bytes(header), _BINARY_HEADER_NUM_BYTES))
+        self.f.write(np.uint32(0).tobytes())
+
+    def write(self, triangles, normals=None):
+        """
+        Writes a batch of triangles.
+
+        Parameters
+        ----------
+        triangles : numpy.recarray with dtype=_dtype(), or array like
+            float with shape (N, 3, 3)
+            Either the triangles, or the vertices of the triangles.
+        normals : array like, float with shape (N, 3) (default: None)
+            Only when 'triangles' are vertices. The surface-normals of the
+            triangles. If None, the normals are computed from the vertices.
+        """
+        if getattr(triangles, "dtype", None) != np.dtype(_dtype()):
+            triangles = init_from_vertices_and_normals(
+                vertices=triangles, normals=normals
+            )
+        else:
+            assert normals is None
 
-        vi1 = vi
-        vertices[vi] = v1
-        vi += 1
+        if self.num_triangles + len(triangles) > np.iinfo(np.uint32).max:
+            raise AssertionError(
+                "Binary STL can not hold more than {:d} triangles.".format(
+                    np.iinfo(np.uint32).max
+                )
+            )
+        self.f.write(np.ascontiguousarray(triangles).data)
+        self.num_triangles += len(triangles)
+
+    def close(self):
+        end = self.f.tell()
+        self.f.seek(self.start + _BINARY_HEADER_NUM_BYTES)
+        self.f.write(np.uint32(self.num_triangles).tobytes())
+        self.f.seek(end)
+        if self.owns_f:
+            self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def __repr__(self):
+        return "{:s}(num_triangles={:d})".format(
+            self.__class__.__name__, self.num_triangles
+        )
 
-        vi2 = vi
-        vertices[vi] = v2
-        vi += 1
 
-        faces[fi] = [vi0, vi1, vi2]
+def to_vertices_and_faces(stl, weld=False):
+    """
+    Returns the vertices and faces of the triangles in 'stl'.
+
+    Parameters
+    ----------
+    stl : numpy.recarray with dtype=_dtype()
+        The triangles.
+    weld : bool (default: False)
+        If False, each face has its own three vertices. If True, vertices
+        with bit-identical coordinates are merged into one vertex. The
+        vertices are ordered by their first appearance in the faces.
+    """
+    num_faces = len(stl)
+    vertices = np.ascontiguousarray(vertices_view(stl)).reshape(
+        (3 * num_faces, 3)
+    )
 
-    assert vi == num_vertices
-    assert fi + 1 == num_faces
+    if weld:
+        _, first, inverse = np.unique(
+            vertices.view(np.dtype((np.void, vertices.strides[0]))),
+            return_index=True,
+            return_inverse=True,
+        )
+        order = np.argsort(first)
+        rank = np.zeros(shape=order.shape[0], dtype=int)
+        rank[order] = np.arange(order.shape[0])
+        faces = rank[inverse.reshape(-1)].reshape((num_faces, 3))
+        vertices = vertices[first[order]]
+    else:
+        faces = np.arange(3 * num_faces).reshape((num_faces, 3))
 
-    return vertices, faces
+    return np.asarray(vertices, dtype=float), faces
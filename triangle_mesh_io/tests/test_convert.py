@@ -14,6 +14,18 @@ def test_convert_off_to_obj():
     )
 
 
+def test_convert_off_to_obj_vertex_normal_weighting():
+    off_cube = tmi.off.minimal()
+    for weighting in ["none", "area", "angle"]:
+        obj_cube = tmi.convert.off_to_obj(
+            off=off_cube,
+            vertex_normal_smooth_eps=np.deg2rad(10.0),
+            vertex_normal_weighting=weighting,
+        )
+        vn = np.asarray(obj_cube["vn"])
+        np.testing.assert_allclose(np.linalg.norm(vn, axis=1), 1.0)
+
+
 def test_convert_stl_to_obj():
     stl_cube = tmi.stl.minimal()
     obj_cube = tmi.convert.stl_to_obj(
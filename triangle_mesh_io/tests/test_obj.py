@@ -1,7 +1,9 @@
 import triangle_mesh_io as tmi
+import numpy as np
 from importlib import resources as importlib_resources
 import tempfile
 import os
+import pytest
 
 
 OBJ_PATH = os.path.join(
@@ -49,3 +51,100 @@ def test_oby_io():
         if diff:
             print(diff)
         assert len(diff) == 0
+
+
+def test_loads_columnar():
+    s = (
+        "# two materials\n"
+        "v 0 0 0\n"
+        "v 1 0 0\n"
+        "v 0 1 0\n"
+        "v 0 0 1.5\n"
+        "vn 0 0 1\n"
+        "vn -1 0 0\n"
+        "usemtl red\n"
+        "f 1//1 2//1 3//1\n"
+        "usemtl blue\n"
+        "f 1//2 3//2 4//2\n"
+        "f 4//2 3//2 1//2\n"
+    )
+    columnar = tmi.obj.loads_columnar(s)
+
+    np.testing.assert_array_equal(
+        columnar["v"], [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1.5]]
+    )
+    np.testing.assert_array_equal(columnar["vn"], [[0, 0, 1], [-1, 0, 0]])
+    np.testing.assert_array_equal(
+        columnar["fv"], [[0, 1, 2], [0, 2, 3], [3, 2, 0]]
+    )
+    np.testing.assert_array_equal(
+        columnar["fvn"], [[0, 0, 0], [1, 1, 1], [1, 1, 1]]
+    )
+    assert columnar["mtl"] == {"red": [0, 1], "blue": [1, 3]}
+
+    obj = tmi.obj.columnar_to_obj(columnar)
+    assert obj["mtl"]["blue"][1] == {"v": [3, 2, 0], "vn": [1, 1, 1]}
+
+
+def test_loads_columnar_with_texture_coordinates():
+    cube = tmi.obj.minimal()
+    s = tmi.obj.dumps(cube)
+    s_with_vt = str.replace(s, "//", "/1/")
+    cube_back = tmi.obj.loads(s_with_vt)
+
+    diff = tmi.obj.diff(cube, cube_back)
+    assert len(diff) == 0
+
+
+def test_loads_face_before_usemtl():
+    s = "v 0 0 0\nv 1 0 0\nv 0 1 0\nvn 0 0 1\nf 1//1 2//1 3//1\n"
+    with pytest.raises(AssertionError):
+        tmi.obj.loads(s)
+
+
+def test_loads_bad_number():
+    s = "v 0 0 0\nv 1 0 x\nv 0 1 0\nvn 0 0 1\nusemtl a\nf 1//1 2//1 3//1\n"
+    with pytest.raises(ValueError):
+        tmi.obj.loads(s)
+
+
+def test_dump_and_dumps_are_equal():
+    with open(OBJ_PATH, "rt") as f:
+        my_thing_obj = tmi.obj.loads(f.read())
+
+    with tempfile.TemporaryDirectory(prefix="triangle_mesh_io_") as tmp:
+        tmp_path = os.path.join(tmp, "my_thing.obj")
+        tmi.obj.dump(my_thing_obj, tmp_path, chunk_size=100)
+
+        with open(tmp_path, "rt") as f:
+            assert f.read() == tmi.obj.dumps(my_thing_obj)
+
+
+def test_dump_shortest_float_format_round_trips():
+    cube = tmi.obj.minimal()
+    cube["v"][0] = [1e-9, 1.0 / 3.0, -123456.789]
+
+    with tempfile.TemporaryDirectory(prefix="triangle_mesh_io_") as tmp:
+        tmp_path = os.path.join(tmp, "cube.obj")
+        tmi.obj.dump(cube, tmp_path, float_format="{}")
+
+        with open(tmp_path, "rt") as f:
+            cube_back = tmi.obj.loads(f.read())
+
+    assert cube_back["v"] == cube["v"]
+    assert cube_back["vn"] == cube["vn"]
+
+
+def test_loads_misaligned_lines():
+    good = "v 1 2 3\nv 4 5 6\nv 7 8 9\nvn 0 0 1\nusemtl a\nf 1//1 2//1 3//1\n"
+    bad_examples = [
+        str.replace(good, "v 1 2 3\nv 4 5 6\n", "v 1 2 3 4\nv 5 6\n"),
+        good + "f 1//1 2//1 3//1 1//1\nf 2//1 3//1\n",
+    ]
+    for bad in bad_examples:
+        with pytest.raises(AssertionError):
+            tmi.obj.loads(bad)
+
+    with_colors = str.replace(good, "v 7 8 9", "v 7 8 9 0.5 0.5 0.5")
+    obj = tmi.obj.loads(with_colors)
+    assert obj["v"][2] == [7, 8, 9]
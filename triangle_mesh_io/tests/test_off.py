@@ -1,6 +1,9 @@
 import triangle_mesh_io as tmi
+import numpy as np
 import tempfile
+from importlib import resources as importlib_resources
 import os
+import pytest
 
 
 def test_minimal():
@@ -20,3 +23,145 @@ def test_minimal():
         if diff:
             print(diff)
         assert len(diff) == 0
+
+
+def test_loads_with_comments_and_blank_lines():
+    cube = tmi.off.minimal()
+    s = tmi.off.dumps(cube)
+    lines = str.splitlines(s)
+    header = lines[0]
+    counts = str.replace(header, "OFF", "")
+    lines = ["# comment", "", "OFF", "  # comment", counts] + lines[1:]
+    lines.insert(9, "")
+    lines.insert(12, "# comment between vertices")
+    lines.insert(17, "   ")
+    lines.append("# comment at the end")
+
+    cube_back = tmi.off.loads(str.join("\n", lines))
+    assert cube_back["v"].shape == (8, 3)
+    assert cube_back["f"].shape == (12, 3)
+    assert len(tmi.off.diff(cube, cube_back)) == 0
+
+
+def test_loads_malformed():
+    s = "OFF 3 1 0\n0 0 0\n1 0 0\n0 1 0\n3 0 1 2\n"
+    off = tmi.off.loads(s)
+    assert off["f"].tolist() == [[0, 1, 2]]
+
+    bad_examples = [
+        "OFF 3 1 0\n0 0 0\n1 0 0\n0 1 0\n4 0 1 2 2\n",
+        "OFF 3 1 0\n0 0 0\n1 0\n0 1 0\n3 0 1 2\n",
+        "OFF 3 1 0\n0 0 0\n1 0 0\n0 1 0\n",
+        "3 1 0\n0 0 0\n1 0 0\n0 1 0\n3 0 1 2\n",
+    ]
+    for bad in bad_examples:
+        with pytest.raises(AssertionError):
+            tmi.off.loads(bad)
+
+
+def test_loads_faces_with_colors_and_trailing_comments():
+    s = "OFF\n3 2 0\n0 0 0\n1 0 0\n0 1 0\n"
+    s_colors = s + "3 0 1 2 255 0 0\n3 2 1 0 0.1 0.2 0.3 1.0\n"
+    off = tmi.off.loads(s_colors)
+    assert off["f"].tolist() == [[0, 1, 2], [2, 1, 0]]
+
+    s_comments = s + "3 0 1 2 # tri\n3 2 1 0\n"
+    off = tmi.off.loads(s_comments)
+    assert off["f"].tolist() == [[0, 1, 2], [2, 1, 0]]
+
+    with pytest.raises(AssertionError):
+        tmi.off.loads(s + "3 0 1 2\n3 2 1\n")
+
+
+def test_dump():
+    cube = tmi.off.minimal()
+
+    with tempfile.TemporaryDirectory(prefix="triangle_mesh_io_") as tmp:
+        cube_path = os.path.join(tmp, "cube.off")
+        tmi.off.dump(cube, cube_path, chunk_size=5)
+
+        with open(cube_path, "rt") as f:
+            s = f.read()
+        assert s == tmi.off.dumps(cube)
+
+        with open(cube_path, "wb") as f:
+            tmi.off.dump(cube, f, float_format="{}")
+
+        with open(cube_path, "rt") as f:
+            cube_back = tmi.off.loads(f.read())
+
+    np.testing.assert_array_equal(cube["v"], cube_back["v"])
+    np.testing.assert_array_equal(cube["f"], cube_back["f"])
+
+
+RESOURCE_PATH = os.path.join(
+    importlib_resources.files("triangle_mesh_io"), "tests", "resources"
+)
+
+
+def test_binary():
+    with open(os.path.join(RESOURCE_PATH, "openucci-rim-disk.off"), "rt") as f:
+        rim = tmi.off.loads(f.read())
+
+    with tempfile.TemporaryDirectory(prefix="triangle_mesh_io_") as tmp:
+        path = os.path.join(tmp, "rim.off")
+        tmi.off.dump(rim, path, mode="b", chunk_size=1000)
+
+        with open(path, "rb") as f:
+            payload = f.read()
+        assert payload.startswith(b"OFF BINARY\n")
+        assert payload == tmi.off.dumps(rim, mode="b")
+
+        rim_back = tmi.off.loads(payload, mode="b")
+        rim_mmap = tmi.off.load(path, mode="b", mmap=True)
+
+        for back in [rim_back, rim_mmap]:
+            assert not back["v"].flags.writeable
+            np.testing.assert_array_equal(
+                rim["v"].astype(np.float32), back["v"]
+            )
+            np.testing.assert_array_equal(rim["f"], back["f"])
+
+            vertices, faces = tmi.off.to_vertices_and_faces(off=back)
+            assert vertices.dtype == float
+            assert faces.dtype == int
+
+        del rim_mmap
+
+        with open(path, "wb") as f:
+            f.write(payload[:-1])
+        with pytest.raises(AssertionError):
+            tmi.off.load(path, mode="b", mmap=True)
+
+
+def test_loads_binary_bad_counts():
+    cube = tmi.off.minimal()
+    payload = tmi.off.dumps(cube, mode="b")
+    counts_offset = len(b"OFF BINARY\n")
+
+    for num_vertices, num_faces in [(-1, 0), (0, -1), (2**31 - 1, 12)]:
+        bad = (
+            payload[:counts_offset]
+            + np.array([num_vertices, num_faces], dtype=">i4").tobytes()
+            + payload[counts_offset + 8 :]
+        )
+        with pytest.raises(AssertionError):
+            tmi.off.loads(bad, mode="b")
+
+
+def test_dumps_positional_arguments():
+    cube = tmi.off.minimal()
+    assert tmi.off.dumps(cube, "{:f}") == tmi.off.dumps(
+        cube, float_format="{:f}"
+    )
+    assert tmi.off.dumps(cube, "{:f}", "b") == tmi.off.dumps(cube, mode="b")
+
+
+def test_loads_misaligned_lines():
+    bad_examples = [
+        "OFF\n2 1 0\n1 2 3 4\n5 6\n3 0 1 0\n",
+        "OFF\n3 2 0\n0 0 0\n1 0 0\n0 1 0\n3 0 1 2 3\n0 1 2\n",
+    ]
+    for bad in bad_examples:
+        with pytest.raises(AssertionError):
+            tmi.off.loads(bad)
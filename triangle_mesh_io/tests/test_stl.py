@@ -3,7 +3,7 @@ import numpy as np
 from importlib import resources as importlib_resources
 import os
 import tempfile
-
+import pytest
 
 STL_ASCII_PATH = os.path.join(
     importlib_resources.files("triangle_mesh_io"),
@@ -108,3 +108,207 @@ def test_convert_teapot_stl_to_obj():
     with open(STL_BINARY_PATH, "rb") as f:
         teapot_stl = tmi.stl.loads(f.read(), mode="b")
     teapot_obj = tmi.convert.stl_to_obj(teapot_stl)
+
+
+def test_load_binary_mmap():
+    with open(STL_BINARY_PATH, "rb") as f:
+        teapot = tmi.stl.loads(f.read(), mode="b")
+
+    teapot_mmap = tmi.stl.load(STL_BINARY_PATH, mode="b", mmap=True)
+    assert isinstance(teapot_mmap, np.memmap)
+    assert not teapot_mmap.flags.writeable
+    assert len(tmi.stl.diff(a=teapot, b=teapot_mmap)) == 0
+
+    teapot_load = tmi.stl.load(STL_BINARY_PATH, mode="b", mmap=False)
+    assert len(tmi.stl.diff(a=teapot, b=teapot_load)) == 0
+
+
+def test_load_binary_truncated():
+    with open(STL_BINARY_PATH, "rb") as f:
+        payload = f.read()
+
+    with tempfile.TemporaryDirectory(prefix="triangle_mesh_io_") as tmp:
+        path = os.path.join(tmp, "truncated.stl")
+        with open(path, "wb") as f:
+            f.write(payload[:-1])
+
+        with pytest.raises(AssertionError):
+            tmi.stl.load(path, mode="b", mmap=True)
+
+        with pytest.raises(AssertionError):
+            tmi.stl.load(path, mode="b", mmap=False)
+
+        with open(path, "wb") as f:
+            f.write(payload[:42])
+
+        with pytest.raises(AssertionError):
+            tmi.stl.load(path, mode="b", mmap=True)
+
+
+def test_iter_binary_blocks():
+    teapot = tmi.stl.load(STL_BINARY_PATH, mode="b")
+    assert tmi.stl.num_triangles_in_binary(STL_BINARY_PATH) == len(teapot)
+
+    blocks = []
+    for block in tmi.stl.iter_binary_blocks(STL_BINARY_PATH, block_size=1000):
+        assert len(block) <= 1000
+        blocks.append(block.copy())
+    teapot_back = np.concatenate(blocks)
+    assert len(tmi.stl.diff(a=teapot, b=teapot_back)) == 0
+
+    with open(STL_BINARY_PATH, "rb") as f:
+        num_blocks = len(list(tmi.stl.iter_binary_blocks(f, block_size=1000)))
+    assert num_blocks == len(blocks)
+
+
+def test_read_binary_block():
+    teapot = tmi.stl.load(STL_BINARY_PATH, mode="b")
+
+    block = tmi.stl.read_binary_block(STL_BINARY_PATH, start=100, num=42)
+    assert len(tmi.stl.diff(a=teapot[100:142], b=block)) == 0
+
+    block = tmi.stl.read_binary_block(
+        STL_BINARY_PATH, start=len(teapot) - 2, num=42
+    )
+    assert len(block) == 2
+    assert len(tmi.stl.diff(a=teapot[-2:], b=block)) == 0
+
+
+def test_binary_writer():
+    teapot = tmi.stl.load(STL_BINARY_PATH, mode="b")
+
+    with tempfile.TemporaryDirectory(prefix="triangle_mesh_io_") as tmp:
+        path = os.path.join(tmp, "teapot.stl")
+        with tmi.stl.BinaryWriter(path, header=b"teapot") as writer:
+            for block in tmi.stl.iter_binary_blocks(
+                STL_BINARY_PATH, block_size=777
+            ):
+                writer.write(block)
+        assert writer.num_triangles == len(teapot)
+
+        teapot_back = tmi.stl.load(path, mode="b")
+        assert len(tmi.stl.diff(a=teapot, b=teapot_back)) == 0
+
+        with open(path, "rb") as f:
+            assert f.read(80).startswith(b"teapot ")
+
+
+def test_binary_writer_vertices():
+    cube = tmi.stl.minimal()
+    vertices, faces = tmi.stl.to_vertices_and_faces(stl=cube)
+    triangles = vertices[faces]
+
+    with tempfile.TemporaryDirectory(prefix="triangle_mesh_io_") as tmp:
+        path = os.path.join(tmp, "cube.stl")
+        with tmi.stl.BinaryWriter(path) as writer:
+            writer.write(triangles[0:5])
+            writer.write(triangles[5:])
+
+        cube_back = tmi.stl.load(path, mode="b")
+
+    assert len(cube_back) == len(cube)
+    for key in ["vertex-0.x", "vertex-1.y", "vertex-2.z"]:
+        np.testing.assert_array_equal(cube[key], cube_back[key])
+
+    for xyz in ["x", "y", "z"]:
+        n = cube["normal." + xyz] / np.linalg.norm(
+            np.c_[cube["normal.x"], cube["normal.y"], cube["normal.z"]],
+            axis=1,
+        )
+        np.testing.assert_allclose(n, cube_back["normal." + xyz], atol=1e-6)
+
+
+def test_loads_ascii_malformed():
+    good = tmi.stl.dumps(tmi.stl.minimal(), mode="t")
+    assert len(tmi.stl.loads(good, mode="t")) == 12
+
+    first_vertex = good.index("vertex")
+    end_of_first_vertex = good.index("\n", first_vertex)
+    bad_examples = [
+        good[:first_vertex] + good[end_of_first_vertex + 1 :],
+        str.replace(good, "outer loop", "outer", 1),
+        good[:end_of_first_vertex] + " 1.0" + good[end_of_first_vertex:],
+        str.replace(good, "vertex 1.0", "vertex a.b", 1),
+        str.replace(good, "solid ", "", 1),
+        str.replace(good, "endloop", "", 1),
+    ]
+
+    # A vertex line moved from the first facet into the second facet.
+    second_endloop = good.index("endloop", good.index("endfacet"))
+    bad_examples.append(
+        good[:first_vertex]
+        + good[end_of_first_vertex + 1 : second_endloop]
+        + good[first_vertex : end_of_first_vertex + 1]
+        + good[second_endloop:]
+    )
+    for bad in bad_examples:
+        with pytest.raises(AssertionError):
+            tmi.stl.loads(bad, mode="t")
+
+
+def test_dump_ascii():
+    with open(STL_ASCII_PATH, "rt") as f:
+        gridfinity = tmi.stl.loads(f.read(), mode="t")
+
+    with tempfile.TemporaryDirectory(prefix="triangle_mesh_io_") as tmp:
+        path = os.path.join(tmp, "gridfinity.stl")
+        tmi.stl.dump(gridfinity, path, mode="t", chunk_size=1000)
+        with open(path, "rt") as f:
+            assert f.read() == tmi.stl.dumps(gridfinity, mode="t")
+
+        tmi.stl.dump(gridfinity, path, mode="t", float_format="{}")
+        gridfinity_back = tmi.stl.load(path, mode="t")
+
+    for key, _ in tmi.stl._dtype()[0:12]:
+        np.testing.assert_array_equal(gridfinity[key], gridfinity_back[key])
+
+
+def test_to_vertices_and_faces():
+    cube = tmi.stl.minimal()
+
+    vertices, faces = tmi.stl.to_vertices_and_faces(stl=cube)
+    assert vertices.shape == (3 * len(cube), 3)
+    assert faces.shape == (len(cube), 3)
+    for i in range(len(cube)):
+        for vert in range(3):
+            for dim, xyz in enumerate(["x", "y", "z"]):
+                key = "vertex-{:d}.{:s}".format(vert, xyz)
+                assert vertices[faces[i, vert], dim] == cube[key][i]
+
+    welded_vertices, welded_faces = tmi.stl.to_vertices_and_faces(
+        stl=cube, weld=True
+    )
+    assert welded_vertices.shape == (8, 3)
+    np.testing.assert_array_equal(
+        welded_vertices[welded_faces], vertices[faces]
+    )
+
+
+def test_views():
+    cube = tmi.stl.minimal()
+
+    vertices = tmi.stl.vertices_view(cube)
+    normals = tmi.stl.normals_view(cube)
+    assert vertices.shape == (len(cube), 3, 3)
+    assert normals.shape == (len(cube), 3)
+    assert vertices.dtype == np.float32
+    assert np.shares_memory(vertices, cube)
+    assert np.shares_memory(normals, cube)
+
+    for i in range(len(cube)):
+        for dim, xyz in enumerate(["x", "y", "z"]):
+            assert normals[i, dim] == cube["normal." + xyz][i]
+            for vert in range(3):
+                key = "vertex-{:d}.{:s}".format(vert, xyz)
+                assert vertices[i, vert, dim] == cube[key][i]
+
+    cube_back = tmi.stl.init_from_vertices_and_normals(
+        vertices=vertices, normals=normals
+    )
+    assert cube_back.tobytes() == cube.tobytes()
+
+    vertices[0, 1, 2] = 42.0
+    assert cube["vertex-1.z"][0] == 42.0
+
+    teapot = tmi.stl.load(STL_BINARY_PATH, mode="b", mmap=True)
+    assert not tmi.stl.vertices_view(teapot).flags.writeable